@@ -1,35 +1,52 @@
 # main.py (updated with better error handling)
+import io
 import os
 import sys
-import yaml
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from pathlib import Path
+from functools import lru_cache
 from dotenv import load_dotenv
 
-# Add src to path
-sys.path.append(str(Path(__file__).parent / "src"))
+# yaml, boto3 and the pandas/sklearn-based pipeline modules are imported
+# where they are first needed so importing this module stays cheap
 
-from config.aws_config import AWSConfig
-from data_preparation.data_ingestion import DataIngestionPipeline
-from data_preparation.data_transformation import DataTransformer
-from data_preparation.data_validation import DataValidator
+# Configure logging; set ML_LOG_FILE to an empty string on ephemeral or
+# read-only compute (Lambda, Fargate) to log to the console only
+log_handlers = [logging.StreamHandler()]
+log_file = os.getenv('ML_LOG_FILE', 'ecommerce_ml.log')
+if log_file:
+    log_handlers.insert(0, logging.FileHandler(log_file))
 
-# Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('ecommerce_ml.log'),
-        logging.StreamHandler()
-    ]
+    handlers=log_handlers
 )
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=16)
+def _load_yaml_cached(path: str, mtime: float, size: int) -> dict:
+    """Parse a YAML file, cached per (path, mtime, size) so edits invalidate it"""
+    import yaml
+    try:
+        # libyaml-backed loader is several times faster than the pure-Python one
+        from yaml import CSafeLoader as YamlLoader
+    except ImportError:
+        from yaml import SafeLoader as YamlLoader
+    
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=YamlLoader)
+
 class EcommerceMLPipeline:
     """Main pipeline orchestrator"""
     
     def __init__(self, config_path: str = "config.yaml"):
+        from config.aws_config import AWSConfig
+        from data_preparation.data_ingestion import DataIngestionPipeline
+        from data_preparation.data_transformation import DataTransformer
+        from data_preparation.data_validation import DataValidator
+        
         # Load environment variables
         load_dotenv()
         
@@ -46,10 +63,15 @@ class EcommerceMLPipeline:
         
         # Load configuration
         try:
-            with open(config_path, 'r') as f:
-                self.config = yaml.safe_load(f)
+            stat = os.stat(config_path)
+            cached_config = _load_yaml_cached(config_path, stat.st_mtime, stat.st_size)
+            
+            # Only the 'aws' section is updated below, so copying the top level
+            # and that section is enough to keep the cached dict pristine
+            self.config = dict(cached_config)
+            self.config['aws'] = dict(cached_config['aws'])
         except FileNotFoundError:
-            logger.warning(f"Config file {config_path} not found, using default configuration")
+            logger.warning("Config file %s not found, using default configuration", config_path)
             self.config = self._get_default_config()
         
         # Update config with environment variables
@@ -61,14 +83,30 @@ class EcommerceMLPipeline:
             region_name=self.config['aws']['region']
         )
         
+        # One S3 client (and connection pool) shared by every pipeline step
+        self.s3_client = self.aws_config.get_client('s3')
+        
+        # Transfer settings for processed-data uploads (multipart above 8 MB,
+        # CRT-backed when awscrt is installed)
+        self.transfer_config = self.aws_config.get_transfer_config(
+            multipart_threshold=8 * 1024 * 1024,
+            multipart_chunksize=8 * 1024 * 1024,
+            max_concurrency=10,
+            use_threads=True
+        )
+        
         # Initialize components
-        self.data_ingestion = DataIngestionPipeline(self.aws_config)
+        self.data_ingestion = DataIngestionPipeline(
+            self.aws_config,
+            cache_dir=self.config['data'].get('cache_dir'),
+            arrow_dtypes=self.config['data'].get('arrow_dtypes', False)
+        )
         self.data_transformer = DataTransformer()
         self.data_validator = DataValidator()
         
         logger.info("EcommerceMLPipeline initialized successfully")
-        logger.info(f"Using S3 bucket: {self.config['aws']['bucket']}")
-        logger.info(f"Using AWS region: {self.config['aws']['region']}")
+        logger.info("Using S3 bucket: %s", self.config['aws']['bucket'])
+        logger.info("Using AWS region: %s", self.config['aws']['region'])
     
     def _get_default_config(self):
         """Return default configuration"""
@@ -80,7 +118,11 @@ class EcommerceMLPipeline:
             'data': {
                 'raw_data_prefix': 'raw-data',
                 'processed_data_prefix': 'processed-data',
-                'feature_store_prefix': 'feature-store'
+                'feature_store_prefix': 'feature-store',
+                'save_local': False,
+                'processed_format': 'parquet',
+                'cache_dir': None,
+                'arrow_dtypes': False
             }
         }
     
@@ -89,13 +131,18 @@ class EcommerceMLPipeline:
         logger.info("Starting data preparation pipeline...")
         
         try:
-            # Step 1: Verify data availability
+            # Steps 1-2: the availability check is a single listing, so it
+            # runs alongside ingestion instead of delaying the first download
             logger.info("Step 1: Verifying data availability")
-            self._verify_data_availability()
-            
-            # Step 2: Data Ingestion
             logger.info("Step 2: Data Ingestion")
-            self._ingest_data()
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                availability = executor.submit(self._verify_data_availability)
+                try:
+                    self._ingest_data()
+                finally:
+                    # A missing-file error explains any ingestion failure,
+                    # so it takes precedence when raised
+                    availability.result()
             
             # Step 3: Data Validation
             logger.info("Step 3: Data Validation")
@@ -112,12 +159,11 @@ class EcommerceMLPipeline:
             logger.info("Data preparation pipeline completed successfully!")
             
         except Exception as e:
-            logger.error(f"Data preparation pipeline failed: {str(e)}")
+            logger.error("Data preparation pipeline failed: %s", e)
             raise
     
     def _verify_data_availability(self):
         """Verify that required data files exist in S3"""
-        s3_client = self.aws_config.get_client('s3')
         bucket = self.config['aws']['bucket']
         
         required_files = [
@@ -126,15 +172,31 @@ class EcommerceMLPipeline:
             'raw-data/transactions/transactions.csv'
         ]
         
+        # List the raw-data prefix once instead of one head_object per file
+        remaining = set(required_files)
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        pages = paginator.paginate(
+            Bucket=bucket,
+            Prefix='raw-data/',
+            PaginationConfig={'PageSize': 1000}
+        )
+
+        for page in pages:
+            for obj in page.get('Contents', []):
+                remaining.discard(obj['Key'])
+
+            # Stop paging as soon as every required file has been seen
+            if not remaining:
+                break
+
         missing_files = []
-        
+
         for file_key in required_files:
-            try:
-                s3_client.head_object(Bucket=bucket, Key=file_key)
-                logger.info(f"✓ Found: s3://{bucket}/{file_key}")
-            except s3_client.exceptions.NoSuchKey:
+            if file_key in remaining:
                 missing_files.append(file_key)
-                logger.warning(f"✗ Missing: s3://{bucket}/{file_key}")
+                logger.warning("✗ Missing: s3://%s/%s", bucket, file_key)
+            else:
+                logger.info("✓ Found: s3://%s/%s", bucket, file_key)
         
         if missing_files:
             logger.error("Missing required data files. Please run:")
@@ -145,90 +207,120 @@ class EcommerceMLPipeline:
     def _ingest_data(self):
         """Data ingestion step"""
         bucket = self.config['aws']['bucket']
-        
-        # Ingest customer data
-        self.customer_data = self.data_ingestion.ingest_from_s3(
-            bucket=bucket,
-            prefix=f"{self.config['data']['raw_data_prefix']}/customers",
-            file_format='csv'
-        )
-        logger.info(f"Ingested {len(self.customer_data)} customer records")
-        
-        # Ingest product data
-        self.product_data = self.data_ingestion.ingest_from_s3(
-            bucket=bucket,
-            prefix=f"{self.config['data']['raw_data_prefix']}/products",
-            file_format='csv'
-        )
-        logger.info(f"Ingested {len(self.product_data)} product records")
-        
-        # Ingest transaction data
-        self.transaction_data = self.data_ingestion.ingest_from_s3(
-            bucket=bucket,
-            prefix=f"{self.config['data']['raw_data_prefix']}/transactions",
-            file_format='csv'
-        )
-        logger.info(f"Ingested {len(self.transaction_data)} transaction records")
+        raw_prefix = self.config['data']['raw_data_prefix']
+
+        # Low-cardinality string columns are parsed straight to category and
+        # numeric columns to narrow types (age fits int16, float32 suffices
+        # for money amounts used as ML features)
+        jobs = {
+            'customer': (
+                f"{raw_prefix}/customers",
+                {'age': 'int16', 'income': 'float32',
+                 'gender': 'category', 'location': 'category'}
+            ),
+            'product': (
+                f"{raw_prefix}/products",
+                {'price': 'float32', 'category': 'category'}
+            ),
+            'transaction': (
+                f"{raw_prefix}/transactions",
+                {'transaction_amount': 'float32'}
+            )
+        }
+
+        # The three ingestions are independent and network-bound, so run
+        # them concurrently instead of one after another
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            futures = {
+                executor.submit(
+                    self.data_ingestion.ingest_from_s3,
+                    bucket=bucket,
+                    prefix=prefix,
+                    file_format='csv',
+                    dtype=dtype
+                ): name
+                for name, (prefix, dtype) in jobs.items()
+            }
+
+            for future in as_completed(futures):
+                name = futures[future]
+                dataframe = future.result()
+                setattr(self, f"{name}_data", dataframe)
+                logger.info("Ingested %d %s records", len(dataframe), name)
     
     def _validate_data(self):
         """Data validation step"""
-        # Define expected schemas
-        customer_schema = {
-            'customer_id': 'string',
-            'age': 'int',
-            'gender': 'string',
-            'income': 'float',
-            'location': 'string',
-            'registration_date': 'string'  # Will be converted to datetime later
-        }
+        # Check data quality; pandas releases the GIL in its C kernels, so
+        # the three independent checks overlap on a small thread pool
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            customer_future = executor.submit(
+                self.data_validator.check_data_quality, self.customer_data
+            )
+            product_future = executor.submit(
+                self.data_validator.check_data_quality, self.product_data
+            )
+            transaction_future = executor.submit(
+                self.data_validator.check_data_quality, self.transaction_data
+            )
         
-        product_schema = {
-            'product_id': 'string',
-            'category': 'string',
-            'price': 'float',
-            'product_description': 'string'
-        }
+        customer_quality = customer_future.result()
+        product_quality = product_future.result()
+        transaction_quality = transaction_future.result()
         
-        transaction_schema = {
-            'transaction_id': 'string',
-            'customer_id': 'string',
-            'product_id': 'string',
-            'transaction_amount': 'float',
-            'transaction_timestamp': 'string'  # Will be converted to datetime later
+        # Check each dataset against its expected schema (metadata only)
+        from data_preparation.data_validation import (
+            CUSTOMER_SCHEMA, PRODUCT_SCHEMA, TRANSACTION_SCHEMA
+        )
+        schema_results = {
+            'customer': self.data_validator.validate_data_schema(
+                self.customer_data, CUSTOMER_SCHEMA
+            ),
+            'product': self.data_validator.validate_data_schema(
+                self.product_data, PRODUCT_SCHEMA
+            ),
+            'transaction': self.data_validator.validate_data_schema(
+                self.transaction_data, TRANSACTION_SCHEMA
+            )
         }
         
-        # Check data quality
-        customer_quality = self.data_validator.check_data_quality(self.customer_data)
-        product_quality = self.data_validator.check_data_quality(self.product_data)
-        transaction_quality = self.data_validator.check_data_quality(self.transaction_data)
-        
         # Log validation results
-        logger.info(f"Customer data quality score: {customer_quality['quality_score']:.2f}")
-        logger.info(f"Product data quality score: {product_quality['quality_score']:.2f}")
-        logger.info(f"Transaction data quality score: {transaction_quality['quality_score']:.2f}")
+        logger.info("Customer data quality score: %.2f", customer_quality['quality_score'])
+        logger.info("Product data quality score: %.2f", product_quality['quality_score'])
+        logger.info("Transaction data quality score: %.2f", transaction_quality['quality_score'])
+        
+        for name, schema_result in schema_results.items():
+            if not schema_result['schema_valid']:
+                logger.warning(
+                    "%s data does not match its expected schema: missing=%s, "
+                    "unexpected=%s, type mismatches=%s",
+                    name.capitalize(), schema_result['missing_columns'],
+                    schema_result['unexpected_columns'],
+                    schema_result['type_mismatches']
+                )
         
         # Store validation results
         self.validation_results = {
             'customer': customer_quality,
             'product': product_quality,
-            'transaction': transaction_quality
+            'transaction': transaction_quality,
+            'schema': schema_results
         }
     
     def _transform_data(self):
         """Data transformation step"""
         # Clean and transform customer data
         self.customer_data_clean = self.data_transformer.clean_customer_data(
-            self.customer_data.copy()
+            self.customer_data
         )
 
         # Transform transaction data — get both aggregated and enriched transaction-level data
         self.customer_aggregated, self.enriched_transaction_data = self.data_transformer.transform_transaction_data(
-            self.transaction_data.copy()
+            self.transaction_data
         )
 
         # Create product features
         self.product_features = self.data_transformer.create_product_features(
-            self.product_data.copy()
+            self.product_data
         )
 
         # Create interaction features using enriched transaction data (with 'month' column)
@@ -246,33 +338,83 @@ class EcommerceMLPipeline:
         bucket = self.config['aws']['bucket']
         prefix = self.config['data']['processed_data_prefix']
         
-        # Create processed data directory locally
-        os.makedirs('data/processed', exist_ok=True)
+        # Local copies are optional; by default data goes straight to S3
+        save_local = self.config['data'].get('save_local', False)
+        if save_local:
+            os.makedirs('data/processed', exist_ok=True)
+        
+        # Parquet (zstd level 3) by default; 'csv' is kept as a fallback format
+        file_format = self.config['data'].get('processed_format', 'parquet')
         
-        # Save processed datasets locally first
         datasets = {
-            'customer_features.csv': self.customer_data_clean,
-            'product_features.csv': self.product_features,
-            'customer_aggregated.csv': self.customer_aggregated,
-            'interaction_features.csv': self.interaction_features
+            'customer_features': self.customer_data_clean,
+            'product_features': self.product_features,
+            'customer_aggregated': self.customer_aggregated,
+            'interaction_features': self.interaction_features
         }
         
-        s3_client = self.aws_config.get_client('s3')
+        # Sparse feature matrices (the product TF-IDF block) are kept out of
+        # the tables; save each as .npz with a row -> product_id index
+        matrices = {}
+        tfidf_matrix = self.data_transformer.feature_matrices.get('product_tfidf')
+        if tfidf_matrix is not None and 'product_id' in self.product_features.columns:
+            import pandas as pd
+            from scipy import sparse
+            
+            matrices['product_tfidf'] = tfidf_matrix
+            datasets['product_tfidf_index'] = pd.DataFrame({
+                'row': range(tfidf_matrix.shape[0]),
+                'product_id': self.product_features['product_id'].to_numpy()
+            })
+        
+        uploads = {}
         
-        for filename, dataframe in datasets.items():
-            local_path = f'data/processed/{filename}'
-            s3_key = f'{prefix}/{filename}'
+        # Uploads are independent, so hand each one to a worker as soon as
+        # it is serialized and let multipart transfers run in parallel
+        with ThreadPoolExecutor(max_workers=len(datasets) + len(matrices)) as executor:
+            def upload(filename, buffer, n_records):
+                s3_key = f'{prefix}/{filename}'
+                buffer.seek(0)
+                
+                if save_local:
+                    local_path = f'data/processed/{filename}'
+                    with open(local_path, 'wb') as f:
+                        f.write(buffer.getbuffer())
+                    logger.info("Saved %s locally with %d records", filename, n_records)
+                
+                # Upload to S3
+                future = executor.submit(
+                    self.s3_client.upload_fileobj, buffer, bucket, s3_key,
+                    Config=self.transfer_config
+                )
+                uploads[future] = (filename, s3_key)
+            
+            for name, dataframe in datasets.items():
+                # Serialize in memory instead of round-tripping through disk
+                buffer = io.BytesIO()
+                if file_format == 'parquet':
+                    dataframe.to_parquet(
+                        buffer, engine='pyarrow', compression='zstd',
+                        compression_level=3, index=False
+                    )
+                elif file_format == 'csv':
+                    dataframe.to_csv(buffer, index=False)
+                else:
+                    raise ValueError(f"Unsupported format: {file_format}")
+                upload(f'{name}.{file_format}', buffer, len(dataframe))
             
-            # Save locally
-            dataframe.to_csv(local_path, index=False)
-            logger.info(f"Saved {filename} locally with {len(dataframe)} records")
+            for name, matrix in matrices.items():
+                buffer = io.BytesIO()
+                sparse.save_npz(buffer, matrix, compressed=True)
+                upload(f'{name}.npz', buffer, matrix.shape[0])
             
-            # Upload to S3
-            try:
-                s3_client.upload_file(local_path, bucket, s3_key)
-                logger.info(f"Uploaded to s3://{bucket}/{s3_key}")
-            except Exception as e:
-                logger.error(f"Failed to upload {filename} to S3: {e}")
+            for future in as_completed(uploads):
+                filename, s3_key = uploads[future]
+                try:
+                    future.result()
+                    logger.info("Uploaded to s3://%s/%s", bucket, s3_key)
+                except Exception as e:
+                    logger.error("Failed to upload %s to S3: %s", filename, e)
 
 def main():
     """Main execution function"""
@@ -286,7 +428,7 @@ def main():
         logger.info("Pipeline execution completed successfully!")
         
     except Exception as e:
-        logger.error(f"Pipeline execution failed: {str(e)}")
+        logger.error("Pipeline execution failed: %s", e)
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -4,12 +4,16 @@ AWS ML Project Cleanup Script
 Removes all AWS resources created by the project
 """
 
-import boto3
 import json
 import time
 import argparse
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import cached_property
 from typing import List, Dict, Any
 import logging
+import os
 from pathlib import Path
 import sys
 
@@ -19,6 +23,41 @@ sys.path.append('src')
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Cleanup fans deletes out over many threads: size the connection pool for
+# them and use adaptive retries so S3 throttling backs the client off
+# instead of failing whole batches
+CLEANUP_CLIENT_OPTIONS = {
+    'max_pool_connections': 64,
+    'retries': {'max_attempts': 10, 'mode': 'adaptive'},
+    'tcp_keepalive': True
+}
+
+# S3 prefixes owned by the project
+PROJECT_PREFIXES = ['raw/', 'processed/', 'models/', 'artifacts/']
+
+# Only this many deleted keys are kept in the report; total_deleted keeps
+# the exact count, so memory and report size stay flat on huge buckets
+DELETED_KEYS_SAMPLE_SIZE = 100
+
+# Naming-convention markers for project-owned SageMaker resources
+PROJECT_NAME_FILTERS = ('ecommerce-ml', 'recommendation')
+
+def _ensure_trailing_slash(prefix: str) -> str:
+    """Normalize an S3 prefix to end in '/'; listing a prefix that stops
+    mid-name forces S3 onto a much slower scan of every matching key"""
+    return prefix if prefix.endswith('/') else prefix + '/'
+
+def _fast_rmtree(path: str) -> None:
+    """Remove a small directory tree with a bare scandir/unlink/rmdir walk,
+    skipping shutil.rmtree's error-handler bookkeeping"""
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                _fast_rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+    os.rmdir(path)
+
 class ProjectCleanup:
     """
     Comprehensive cleanup for AWS ML project resources
@@ -27,19 +66,59 @@ class ProjectCleanup:
     def __init__(self, aws_config, dry_run: bool = False):
         self.aws_config = aws_config
         self.dry_run = dry_run
-        self.s3_client = aws_config.s3_client
-        self.glue_client = aws_config.glue_client
-        self.sagemaker_client = aws_config.sagemaker_client
         self.cleanup_log = []
+        self._clients = {}
+        self._clients_lock = threading.RLock()
         
         if dry_run:
             logger.info("🔍 DRY RUN MODE - No resources will be deleted")
         else:
             logger.warning("⚠️  LIVE MODE - Resources will be permanently deleted!")
     
-    def cleanup_all(self, confirm: bool = False) -> Dict[str, Any]:
-        """Run complete cleanup"""
+    # Clients are created on first use, so local-only cleanup never loads
+    # botocore; all of them share one session and tuned client config.
+    # Session.client() is not thread-safe, so creation is serialized
+    def _client(self, service_name: str):
+        client = self._clients.get(service_name)
+        if client is None:
+            with self._clients_lock:
+                client = self._clients.get(service_name)
+                if client is None:
+                    from botocore.config import Config
+                    
+                    client = self.aws_config.get_session().client(
+                        service_name, config=Config(**CLEANUP_CLIENT_OPTIONS)
+                    )
+                    self._clients[service_name] = client
+        return client
+    
+    @property
+    def s3_client(self):
+        return self._client('s3')
+    
+    @property
+    def glue_client(self):
+        return self._client('glue')
+    
+    @property
+    def sagemaker_client(self):
+        return self._client('sagemaker')
+    
+    @cached_property
+    def _s3_list_paginator(self):
+        # Paginators are stateless, so one is reused for every prefix
+        with self._clients_lock:
+            return self.s3_client.get_paginator('list_objects_v2')
+    
+    def cleanup_all(self, confirm: bool = False, use_lifecycle: bool = False) -> Dict[str, Any]:
+        """Run complete cleanup; use_lifecycle hands S3 object deletion to a
+        bucket lifecycle rule instead of deleting objects client-side"""
         if not confirm and not self.dry_run:
+            # Fail fast instead of blocking on input() in CI or other
+            # unattended runs
+            if not sys.stdin.isatty():
+                raise RuntimeError("Non-interactive cleanup requires --confirm")
+            
             response = input("Are you sure you want to delete ALL project resources? (yes/no): ")
             if response.lower() != 'yes':
                 logger.info("Cleanup cancelled by user")
@@ -56,7 +135,10 @@ class ProjectCleanup:
         # Cleanup in reverse dependency order
         cleanup_results['results']['sagemaker'] = self._cleanup_sagemaker_resources()
         cleanup_results['results']['glue'] = self._cleanup_glue_resources()
-        cleanup_results['results']['s3'] = self._cleanup_s3_resources()
+        if use_lifecycle:
+            cleanup_results['results']['s3'] = self._cleanup_s3_via_lifecycle()
+        else:
+            cleanup_results['results']['s3'] = self._cleanup_s3_resources()
         cleanup_results['results']['local'] = self._cleanup_local_resources()
         
         # Generate cleanup report
@@ -73,74 +155,201 @@ class ProjectCleanup:
             'deleted_objects': [],
             'errors': [],
             'total_deleted': 0,
+            'total_size_deleted_bytes': 0,
             'total_size_deleted_mb': 0
         }
         
         try:
             # List all objects in the bucket with our project prefix
-            project_prefixes = ['raw/', 'processed/', 'models/', 'artifacts/']
+            project_prefixes = PROJECT_PREFIXES
             
-            for prefix in project_prefixes:
-                logger.info(f"Cleaning up S3 prefix: {prefix}")
-                
-                # List objects with pagination
-                paginator = self.s3_client.get_paginator('list_objects_v2')
-                pages = paginator.paginate(
-                    Bucket=self.aws_config.s3_bucket,
-                    Prefix=prefix
-                )
-                
-                objects_to_delete = []
-                
-                for page in pages:
-                    if 'Contents' in page:
-                        for obj in page['Contents']:
-                            objects_to_delete.append({
-                                'Key': obj['Key'],
-                                'Size': obj['Size']
-                            })
-                            s3_results['total_size_deleted_mb'] += obj['Size'] / (1024 * 1024)
+            # Prefixes are listed concurrently and each 1000-key batch is
+            # deleted as soon as it is listed; the bounded queue keeps at
+            # most a few batches in memory instead of every key in the bucket
+            batches = queue.Queue(maxsize=32)
+            results_lock = threading.Lock()
+            delete_workers = 8
+            
+            # Build the shared client and paginator here, before any worker
+            # or lister thread can race to create them
+            self._s3_list_paginator
+            
+            with ThreadPoolExecutor(max_workers=delete_workers) as delete_executor:
+                workers = [
+                    delete_executor.submit(self._delete_worker, batches, s3_results, results_lock)
+                    for _ in range(delete_workers)
+                ]
                 
-                # Delete objects in batches of 1000 (S3 limit)
-                batch_size = 1000
-                for i in range(0, len(objects_to_delete), batch_size):
-                    batch = objects_to_delete[i:i + batch_size]
-                    
-                    if self.dry_run:
-                        logger.info(f"[DRY RUN] Would delete {len(batch)} objects from S3")
-                        s3_results['deleted_objects'].extend([obj['Key'] for obj in batch])
-                        s3_results['total_deleted'] += len(batch)
-                    else:
-                        try:
-                            delete_objects = [{'Key': obj['Key']} for obj in batch]
-                            
-                            response = self.s3_client.delete_objects(
-                                Bucket=self.aws_config.s3_bucket,
-                                Delete={'Objects': delete_objects}
-                            )
-                            
-                            if 'Deleted' in response:
-                                deleted_keys = [obj['Key'] for obj in response['Deleted']]
-                                s3_results['deleted_objects'].extend(deleted_keys)
-                                s3_results['total_deleted'] += len(deleted_keys)
-                                logger.info(f"Deleted {len(deleted_keys)} objects from S3")
-                            
-                            if 'Errors' in response:
-                                s3_results['errors'].extend(response['Errors'])
-                                logger.error(f"Errors deleting objects: {response['Errors']}")
+                try:
+                    with ThreadPoolExecutor(max_workers=len(project_prefixes)) as list_executor:
+                        listers = [
+                            list_executor.submit(self._list_prefix_batches, prefix, batches)
+                            for prefix in project_prefixes
+                        ]
                         
-                        except Exception as e:
-                            error_msg = f"Failed to delete batch: {str(e)}"
-                            s3_results['errors'].append(error_msg)
-                            logger.error(error_msg)
+                        for future in as_completed(listers):
+                            try:
+                                future.result()
+                            except Exception as e:
+                                error_msg = f"Failed to list S3 objects: {str(e)}"
+                                with results_lock:
+                                    s3_results['errors'].append(error_msg)
+                                logger.error(error_msg)
+                finally:
+                    # One sentinel per worker once listing is done
+                    for _ in workers:
+                        batches.put(None)
         
         except Exception as e:
             error_msg = f"Failed to cleanup S3 resources: {str(e)}"
             s3_results['errors'].append(error_msg)
             logger.error(error_msg)
         
+        # Sizes are summed as exact integer bytes and converted once
+        s3_results['total_size_deleted_mb'] = s3_results['total_size_deleted_bytes'] / (1024 * 1024)
+        
         return s3_results
     
+    def _cleanup_s3_via_lifecycle(self) -> Dict[str, Any]:
+        """Expire project S3 objects with a bucket lifecycle rule
+        
+        S3 deletes the objects itself (within about a day), so client-side
+        work is constant no matter how many objects the prefixes hold.
+        Existing rules of other IDs are preserved, since the put call
+        replaces the whole lifecycle configuration.
+        """
+        logger.info("Cleaning up S3 resources via lifecycle rules...")
+        
+        bucket = self.aws_config.s3_bucket
+        s3_results = {
+            'bucket': bucket,
+            'lifecycle_rules': [],
+            'deleted_objects': [],
+            'errors': [],
+            'total_deleted': 0,
+            'total_size_deleted_mb': 0
+        }
+        
+        rules = [
+            {
+                'ID': f"project-cleanup-{prefix.rstrip('/')}",
+                'Status': 'Enabled',
+                'Filter': {'Prefix': _ensure_trailing_slash(prefix)},
+                'Expiration': {'Days': 1},
+                'AbortIncompleteMultipartUpload': {'DaysAfterInitiation': 1}
+            }
+            for prefix in PROJECT_PREFIXES
+        ]
+        rule_ids = {rule['ID'] for rule in rules}
+        s3_results['lifecycle_rules'] = sorted(rule_ids)
+        
+        if self.dry_run:
+            logger.info(f"[DRY RUN] Would add lifecycle expiration rules to {bucket}: {sorted(rule_ids)}")
+            return s3_results
+        
+        try:
+            try:
+                existing = self.s3_client.get_bucket_lifecycle_configuration(Bucket=bucket)['Rules']
+            except self.s3_client.exceptions.ClientError as e:
+                if e.response['Error']['Code'] != 'NoSuchLifecycleConfiguration':
+                    raise
+                existing = []
+            
+            kept = [rule for rule in existing if rule.get('ID') not in rule_ids]
+            self.s3_client.put_bucket_lifecycle_configuration(
+                Bucket=bucket,
+                LifecycleConfiguration={'Rules': kept + rules}
+            )
+            logger.info(f"Added lifecycle expiration rules to {bucket}: {sorted(rule_ids)}")
+        
+        except Exception as e:
+            error_msg = f"Failed to set S3 lifecycle rules: {str(e)}"
+            s3_results['errors'].append(error_msg)
+            logger.error(error_msg)
+        
+        return s3_results
+    
+    def _iter_key_batches(self, prefix: str, size: int = 1000):
+        """Yield (keys, total_bytes) for a prefix as pages arrive, where keys
+        is a plain list of up to `size` key strings (1000 is the
+        DeleteObjects limit); the request payload is built only when sent"""
+        # List objects with pagination
+        pages = self._s3_list_paginator.paginate(
+            Bucket=self.aws_config.s3_bucket,
+            Prefix=_ensure_trailing_slash(prefix)
+        )
+        
+        keys = []
+        total_bytes = 0
+        
+        for page in pages:
+            for obj in page.get('Contents', ()):
+                keys.append(obj['Key'])
+                total_bytes += obj['Size']
+                
+                if len(keys) == size:
+                    yield keys, total_bytes
+                    keys, total_bytes = [], 0
+        
+        if keys:
+            yield keys, total_bytes
+    
+    def _list_prefix_batches(self, prefix: str, batches: queue.Queue) -> None:
+        """Queue the key batches of one prefix for the delete workers"""
+        logger.info(f"Cleaning up S3 prefix: {prefix}")
+        
+        for item in self._iter_key_batches(prefix):
+            batches.put(item)
+    
+    def _delete_worker(self, batches: queue.Queue, s3_results: Dict[str, Any],
+                       results_lock: threading.Lock) -> None:
+        """Delete queued batches until a None sentinel arrives"""
+        while True:
+            item = batches.get()
+            if item is None:
+                return
+            
+            keys, batch_bytes = item
+            
+            if self.dry_run:
+                logger.info(f"[DRY RUN] Would delete {len(keys)} objects from S3")
+                with results_lock:
+                    self._record_deleted_keys(s3_results, keys)
+                    s3_results['total_size_deleted_bytes'] += batch_bytes
+                continue
+            
+            try:
+                response = self.s3_client.delete_objects(
+                    Bucket=self.aws_config.s3_bucket,
+                    Delete={'Objects': [{'Key': key} for key in keys]}
+                )
+                
+                with results_lock:
+                    s3_results['total_size_deleted_bytes'] += batch_bytes
+                    
+                    if 'Deleted' in response:
+                        deleted_keys = [obj['Key'] for obj in response['Deleted']]
+                        self._record_deleted_keys(s3_results, deleted_keys)
+                        logger.info(f"Deleted {len(deleted_keys)} objects from S3")
+                    
+                    if 'Errors' in response:
+                        s3_results['errors'].extend(response['Errors'])
+                        logger.error(f"Errors deleting objects: {response['Errors']}")
+            
+            except Exception as e:
+                error_msg = f"Failed to delete batch: {str(e)}"
+                with results_lock:
+                    s3_results['errors'].append(error_msg)
+                logger.error(error_msg)
+    
+    @staticmethod
+    def _record_deleted_keys(s3_results: Dict[str, Any], keys: List[str]) -> None:
+        """Count deleted keys, keeping only a bounded sample of their names"""
+        room = DELETED_KEYS_SAMPLE_SIZE - len(s3_results['deleted_objects'])
+        if room > 0:
+            s3_results['deleted_objects'].extend(keys[:room])
+        s3_results['total_deleted'] += len(keys)
+    
     def _cleanup_glue_resources(self) -> Dict[str, Any]:
         """Clean up AWS Glue resources"""
         logger.info("Cleaning up Glue resources...")
@@ -171,18 +380,9 @@ class ProjectCleanup:
                         try:
                             # Delete partitions first if table is partitioned
                             if table.get('PartitionKeys'):
-                                partitions_response = self.glue_client.get_partitions(
-                                    DatabaseName=database_name,
-                                    TableName=table_name
+                                glue_results['partitions_deleted'] += self._delete_table_partitions(
+                                    database_name, table_name, glue_results['errors']
                                 )
-                                
-                                for partition in partitions_response['Partitions']:
-                                    self.glue_client.delete_partition(
-                                        DatabaseName=database_name,
-                                        TableName=table_name,
-                                        PartitionValues=partition['Values']
-                                    )
-                                    glue_results['partitions_deleted'] += 1
                             
                             # Delete table
                             self.glue_client.delete_table(
@@ -227,6 +427,40 @@ class ProjectCleanup:
         
         return glue_results
     
+    def _delete_table_partitions(self, database_name: str, table_name: str,
+                                 errors: List[Any]) -> int:
+        """Delete every partition of a Glue table, 25 per call (API limit);
+        returns the number of partitions deleted"""
+        paginator = self.glue_client.get_paginator('get_partitions')
+        pages = paginator.paginate(
+            DatabaseName=database_name,
+            TableName=table_name
+        )
+        
+        partition_values = [
+            {'Values': partition['Values']}
+            for page in pages
+            for partition in page['Partitions']
+        ]
+        
+        deleted = 0
+        batch_size = 25
+        for i in range(0, len(partition_values), batch_size):
+            batch = partition_values[i:i + batch_size]
+            response = self.glue_client.batch_delete_partition(
+                DatabaseName=database_name,
+                TableName=table_name,
+                PartitionsToDelete=batch
+            )
+            
+            failed = response.get('Errors', [])
+            if failed:
+                errors.extend(failed)
+                logger.error(f"Errors deleting partitions of {table_name}: {failed}")
+            deleted += len(batch) - len(failed)
+        
+        return deleted
+    
     def _cleanup_sagemaker_resources(self) -> Dict[str, Any]:
         """Clean up SageMaker resources"""
         logger.info("Cleaning up SageMaker resources...")
@@ -240,59 +474,52 @@ class ProjectCleanup:
         }
         
         try:
-            # List and delete endpoints
-            endpoints_response = self.sagemaker_client.list_endpoints()
+            # List and delete endpoints (filtered server-side by name)
+            project_endpoints = self._list_project_names(
+                'list_endpoints', 'Endpoints', 'EndpointName'
+            )
             
-            for endpoint in endpoints_response['Endpoints']:
-                endpoint_name = endpoint['EndpointName']
-                
-                # Check if endpoint belongs to our project (by naming convention)
-                if 'ecommerce-ml' in endpoint_name.lower() or 'recommendation' in endpoint_name.lower():
-                    if self.dry_run:
-                        logger.info(f"[DRY RUN] Would delete SageMaker endpoint: {endpoint_name}")
+            for endpoint_name in project_endpoints:
+                if self.dry_run:
+                    logger.info(f"[DRY RUN] Would delete SageMaker endpoint: {endpoint_name}")
+                    sagemaker_results['endpoints_deleted'].append(endpoint_name)
+                else:
+                    try:
+                        self.sagemaker_client.delete_endpoint(EndpointName=endpoint_name)
                         sagemaker_results['endpoints_deleted'].append(endpoint_name)
-                    else:
-                        try:
-                            self.sagemaker_client.delete_endpoint(EndpointName=endpoint_name)
-                            sagemaker_results['endpoints_deleted'].append(endpoint_name)
-                            logger.info(f"Deleted SageMaker endpoint: {endpoint_name}")
-                        except Exception as e:
-                            error_msg = f"Failed to delete endpoint {endpoint_name}: {str(e)}"
-                            sagemaker_results['errors'].append(error_msg)
-                            logger.error(error_msg)
+                        logger.info(f"Deleted SageMaker endpoint: {endpoint_name}")
+                    except Exception as e:
+                        error_msg = f"Failed to delete endpoint {endpoint_name}: {str(e)}"
+                        sagemaker_results['errors'].append(error_msg)
+                        logger.error(error_msg)
             
             # List and delete models
-            models_response = self.sagemaker_client.list_models()
+            project_models = self._list_project_names(
+                'list_models', 'Models', 'ModelName'
+            )
             
-            for model in models_response['Models']:
-                model_name = model['ModelName']
-                
-                # Check if model belongs to our project
-                if 'ecommerce-ml' in model_name.lower() or 'recommendation' in model_name.lower():
-                    if self.dry_run:
-                        logger.info(f"[DRY RUN] Would delete SageMaker model: {model_name}")
+            for model_name in project_models:
+                if self.dry_run:
+                    logger.info(f"[DRY RUN] Would delete SageMaker model: {model_name}")
+                    sagemaker_results['models_deleted'].append(model_name)
+                else:
+                    try:
+                        self.sagemaker_client.delete_model(ModelName=model_name)
                         sagemaker_results['models_deleted'].append(model_name)
-                    else:
-                        try:
-                            self.sagemaker_client.delete_model(ModelName=model_name)
-                            sagemaker_results['models_deleted'].append(model_name)
-                            logger.info(f"Deleted SageMaker model: {model_name}")
-                        except Exception as e:
-                            error_msg = f"Failed to delete model {model_name}: {str(e)}"
-                            sagemaker_results['errors'].append(error_msg)
-                            logger.error(error_msg)
+                        logger.info(f"Deleted SageMaker model: {model_name}")
+                    except Exception as e:
+                        error_msg = f"Failed to delete model {model_name}: {str(e)}"
+                        sagemaker_results['errors'].append(error_msg)
+                        logger.error(error_msg)
             
             # List training jobs (cannot delete, but list for reference)
-            training_jobs_response = self.sagemaker_client.list_training_jobs(
-                StatusEquals='Completed',
-                MaxResults=100
+            project_training_jobs = self._list_project_names(
+                'list_training_jobs',
+                'TrainingJobSummaries',
+                'TrainingJobName',
+                StatusEquals='Completed'
             )
             
-            project_training_jobs = [
-                job['TrainingJobName'] for job in training_jobs_response['TrainingJobSummaries']
-                if 'ecommerce-ml' in job['TrainingJobName'].lower() or 'recommendation' in job['TrainingJobName'].lower()
-            ]
-            
             sagemaker_results['training_jobs'] = project_training_jobs
             if project_training_jobs:
                 logger.info(f"Found {len(project_training_jobs)} training jobs (cannot be deleted)")
@@ -304,6 +531,20 @@ class ProjectCleanup:
         
         return sagemaker_results
     
+    def _list_project_names(self, operation: str, result_key: str, name_key: str,
+                            **kwargs) -> List[str]:
+        """Names of project resources from a paginated SageMaker list
+        operation, using NameContains so only matching resources come back"""
+        paginator = self.sagemaker_client.get_paginator(operation)
+        names = {}
+        for name_filter in PROJECT_NAME_FILTERS:
+            # Paginate past the first page instead of silently truncating
+            for page in paginator.paginate(NameContains=name_filter, **kwargs):
+                for item in page[result_key]:
+                    # A name can match both filters; keep the first occurrence
+                    names.setdefault(item[name_key], None)
+        return list(names)
+    
     def _cleanup_local_resources(self) -> Dict[str, Any]:
         """Clean up local project files"""
         logger.info("Cleaning up local resources...")
@@ -336,17 +577,31 @@ class ProjectCleanup:
                 '.DS_Store'
             ]
             
-            # Remove directories
-            for dir_path in directories_to_clean:
-                path = Path(dir_path)
-                if path.exists():
-                    if self.dry_run:
-                        logger.info(f"[DRY RUN] Would remove directory: {dir_path}")
-                        local_results['directories_removed'].append(str(path))
-                    else:
+            # Remove directories; the trees are disjoint and rmtree is bound
+            # on unlink syscalls, so they are removed concurrently
+            existing_dirs = [dir_path for dir_path in directories_to_clean if Path(dir_path).exists()]
+            
+            if self.dry_run:
+                for dir_path in existing_dirs:
+                    logger.info(f"[DRY RUN] Would remove directory: {dir_path}")
+                    local_results['directories_removed'].append(str(Path(dir_path)))
+            elif existing_dirs:
+                with ThreadPoolExecutor(max_workers=min(8, len(existing_dirs))) as executor:
+                    futures = {
+                        # __pycache__ trees hold a handful of .pyc files, so
+                        # the lean walk is enough; data dirs keep rmtree
+                        executor.submit(
+                            _fast_rmtree if Path(dir_path).name == '__pycache__' else shutil.rmtree,
+                            dir_path
+                        ): dir_path
+                        for dir_path in existing_dirs
+                    }
+                    
+                    for future in as_completed(futures):
+                        dir_path = futures[future]
                         try:
-                            shutil.rmtree(path)
-                            local_results['directories_removed'].append(str(path))
+                            future.result()
+                            local_results['directories_removed'].append(str(Path(dir_path)))
                             logger.info(f"Removed directory: {dir_path}")
                         except Exception as e:
                             error_msg = f"Failed to remove directory {dir_path}: {str(e)}"
@@ -396,8 +651,17 @@ class ProjectCleanup:
         }
         
         if not self.dry_run:
-            with open(report_path, 'w') as f:
-                json.dump(cleanup_results, f, indent=2, default=str)
+            try:
+                import orjson
+                
+                # orjson encodes the (potentially long) key lists in C and
+                # writes bytes without building an intermediate str
+                with open(report_path, 'wb') as f:
+                    f.write(orjson.dumps(cleanup_results, default=str,
+                                         option=orjson.OPT_INDENT_2))
+            except ImportError:
+                with open(report_path, 'w') as f:
+                    json.dump(cleanup_results, f, indent=2, default=str)
             logger.info(f"📋 Cleanup report saved to {report_path}")
         
         # Print summary
@@ -437,19 +701,28 @@ def main():
     parser.add_argument('--s3-only', action='store_true', help='Clean up S3 resources only')
     parser.add_argument('--glue-only', action='store_true', help='Clean up Glue resources only')
     parser.add_argument('--local-only', action='store_true', help='Clean up local resources only')
+    parser.add_argument('--lifecycle', action='store_true',
+                        help='Expire S3 objects with a bucket lifecycle rule instead of deleting them (for very large buckets)')
     
     args = parser.parse_args()
     
     try:
-        from config.aws_config import AWSConfig
+        # Local-only cleanup never touches AWS, so skip loading the SDK
+        if args.local_only:
+            aws_config = None
+        else:
+            from config.aws_config import AWSConfig
+            aws_config = AWSConfig()
         
         # Initialize
-        aws_config = AWSConfig()
         cleanup = ProjectCleanup(aws_config, dry_run=args.dry_run)
         
         # Selective cleanup
         if args.s3_only:
-            result = cleanup._cleanup_s3_resources()
+            if args.lifecycle:
+                result = cleanup._cleanup_s3_via_lifecycle()
+            else:
+                result = cleanup._cleanup_s3_resources()
             print(f"S3 cleanup result: {json.dumps(result, indent=2, default=str)}")
         elif args.glue_only:
             result = cleanup._cleanup_glue_resources()
@@ -459,7 +732,7 @@ def main():
             print(f"Local cleanup result: {json.dumps(result, indent=2, default=str)}")
         else:
             # Full cleanup
-            results = cleanup.cleanup_all(confirm=args.confirm)
+            results = cleanup.cleanup_all(confirm=args.confirm, use_lifecycle=args.lifecycle)
             
             # Exit with error code if cleanup failed
             if results.get('summary', {}).get('total_errors', 0) > 0:
@@ -1,73 +1,78 @@
 # scripts/generate_sample_data.py
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-import random
+import argparse
 import os
 
-def generate_sample_data():
-    """Generate sample data for testing"""
+def _sequential_ids(prefix: str, n: int, width: int):
+    """'{prefix}000000'-style IDs for 0..n-1, formatted in one vectorized pass"""
+    import numpy as np
     
-    # Set random seed for reproducibility
-    np.random.seed(42)
-    random.seed(42)
+    return np.char.add(prefix, np.char.zfill(np.arange(n).astype(str), width))
+
+def generate_sample_data(file_format: str = 'csv'):
+    """Generate sample data for testing
     
-    # Generate customer data
-    n_customers = 1000
-    customers = []
+    file_format='parquet' writes zstd-compressed Parquet via pyarrow, which
+    is faster to write and read back and several times smaller than CSV.
+    """
+    # Imported here so --help and argument errors return immediately
+    import numpy as np
+    import pandas as pd
     
-    for i in range(n_customers):
-        customer = {
-            'customer_id': f'CUST_{i:06d}',
-            'age': np.random.randint(18, 80),
-            'gender': np.random.choice(['Male', 'Female', 'Other']),
-            'income': np.random.normal(50000, 15000),
-            'location': np.random.choice(['New York', 'California', 'Texas', 'Florida', 'Illinois']),
-            'registration_date': datetime.now() - timedelta(days=np.random.randint(1, 1000))
-        }
-        customers.append(customer)
+    # One seeded generator for reproducibility; every column below is drawn
+    # in a single vectorized call instead of one scalar draw per row
+    rng = np.random.default_rng(42)
+    now = pd.Timestamp.now()
     
-    customer_df = pd.DataFrame(customers)
+    # Generate customer data
+    n_customers = 1000
+    customer_df = pd.DataFrame({
+        'customer_id': _sequential_ids('CUST_', n_customers, 6),
+        'age': rng.integers(18, 80, n_customers),
+        'gender': rng.choice(['Male', 'Female', 'Other'], n_customers),
+        'income': rng.normal(50000, 15000, n_customers),
+        'location': rng.choice(['New York', 'California', 'Texas', 'Florida', 'Illinois'], n_customers),
+        'registration_date': now - pd.to_timedelta(rng.integers(1, 1000, n_customers), unit='D')
+    })
     
     # Generate product data
     categories = ['Electronics', 'Clothing', 'Books', 'Home & Garden', 'Sports']
     n_products = 500
-    products = []
-    
-    for i in range(n_products):
-        product = {
-            'product_id': f'PROD_{i:06d}',
-            'category': np.random.choice(categories),
-            'price': np.random.uniform(10, 500),
-            'product_description': f'Sample product description for product {i}'
-        }
-        products.append(product)
-    
-    product_df = pd.DataFrame(products)
+    product_df = pd.DataFrame({
+        'product_id': _sequential_ids('PROD_', n_products, 6),
+        'category': rng.choice(categories, n_products),
+        'price': rng.uniform(10, 500, n_products),
+        'product_description': np.char.add('Sample product description for product ',
+                                           np.arange(n_products).astype(str))
+    })
     
     # Generate transaction data
     n_transactions = 5000
-    transactions = []
-    
-    for i in range(n_transactions):
-        transaction = {
-            'transaction_id': f'TXN_{i:08d}',
-            'customer_id': np.random.choice(customer_df['customer_id']),
-            'product_id': np.random.choice(product_df['product_id']),
-            'transaction_amount': np.random.uniform(10, 300),
-            'transaction_timestamp': datetime.now() - timedelta(days=np.random.randint(1, 365))
-        }
-        transactions.append(transaction)
-    
-    transaction_df = pd.DataFrame(transactions)
+    transaction_df = pd.DataFrame({
+        'transaction_id': _sequential_ids('TXN_', n_transactions, 8),
+        'customer_id': rng.choice(customer_df['customer_id'].to_numpy(), n_transactions),
+        'product_id': rng.choice(product_df['product_id'].to_numpy(), n_transactions),
+        'transaction_amount': rng.uniform(10, 300, n_transactions),
+        'transaction_timestamp': now - pd.to_timedelta(rng.integers(1, 365, n_transactions), unit='D')
+    })
     
     # Create data directories
     os.makedirs('data/sample', exist_ok=True)
     
     # Save sample data
-    customer_df.to_csv('data/sample/customers.csv', index=False)
-    product_df.to_csv('data/sample/products.csv', index=False)
-    transaction_df.to_csv('data/sample/transactions.csv', index=False)
+    datasets = {
+        'customers': customer_df,
+        'products': product_df,
+        'transactions': transaction_df
+    }
+    
+    for name, df in datasets.items():
+        path = f'data/sample/{name}.{file_format}'
+        if file_format == 'parquet':
+            df.to_parquet(path, engine='pyarrow', compression='zstd', index=False)
+        elif file_format == 'csv':
+            df.to_csv(path, index=False)
+        else:
+            raise ValueError(f"Unsupported format: {file_format}")
     
     print("Sample data generated successfully!")
     print(f"Customers: {len(customer_df)}")
@@ -75,4 +80,9 @@ def generate_sample_data():
     print(f"Transactions: {len(transaction_df)}")
 
 if __name__ == "__main__":
-    generate_sample_data()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Generate sample e-commerce data')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv',
+                        help='Output format (upload_sample_data.py and the pipeline read csv)')
+    args = parser.parse_args()
+    
+    generate_sample_data(file_format=args.format)
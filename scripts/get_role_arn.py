@@ -1,7 +1,7 @@
 # scripts/get_role_arn.py
 import boto3
 import os
-from dotenv import load_dotenv
+from dotenv import load_dotenv, get_key, set_key
 
 def get_role_arn():
     """Get the SageMaker role ARN and update .env"""
@@ -15,26 +15,13 @@ def get_role_arn():
         role_arn = response['Role']['Arn']
         print(f"SageMaker Role ARN: {role_arn}")
         
-        # Update .env file
+        # Update .env file, skipping the rewrite when the value is current
         try:
-            with open('.env', 'r') as f:
-                lines = f.readlines()
-            
-            # Update or add SAGEMAKER_ROLE
-            updated = False
-            for i, line in enumerate(lines):
-                if line.startswith('SAGEMAKER_ROLE='):
-                    lines[i] = f'SAGEMAKER_ROLE={role_arn}\n'
-                    updated = True
-                    break
-            
-            if not updated:
-                lines.append(f'SAGEMAKER_ROLE={role_arn}\n')
-            
-            with open('.env', 'w') as f:
-                f.writelines(lines)
-            
-            print("Updated .env file with correct role ARN")
+            if get_key('.env', 'SAGEMAKER_ROLE') == role_arn:
+                print(".env file already has the correct role ARN")
+            else:
+                set_key('.env', 'SAGEMAKER_ROLE', role_arn, quote_mode='never')
+                print("Updated .env file with correct role ARN")
             
         except Exception as e:
             print(f"Could not update .env file: {e}")
@@ -16,13 +16,22 @@ def install_dependencies():
     
     print("🔧 Installing missing dependencies...")
     
-    for dep in dependencies:
-        try:
-            print(f"Installing {dep}...")
-            subprocess.check_call([sys.executable, '-m', 'pip', 'install', dep])
-            print(f"✅ {dep} installed successfully")
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Failed to install {dep}: {e}")
+    # One pip run resolves all packages together and pays pip's startup and
+    # index overhead once instead of once per package
+    try:
+        print(f"Installing {', '.join(dependencies)}...")
+        subprocess.check_call([sys.executable, '-m', 'pip', 'install', *dependencies])
+        print("✅ All packages installed successfully")
+    except subprocess.CalledProcessError:
+        # Retry one by one only to report which package is failing
+        print("⚠️  Combined install failed, retrying packages individually...")
+        for dep in dependencies:
+            try:
+                print(f"Installing {dep}...")
+                subprocess.check_call([sys.executable, '-m', 'pip', 'install', dep])
+                print(f"✅ {dep} installed successfully")
+            except subprocess.CalledProcessError as e:
+                print(f"❌ Failed to install {dep}: {e}")
     
     print("🎉 All dependencies installed!")
 
@@ -1,31 +1,36 @@
 # scripts/monitor_pipeline.py
 import boto3
 import json
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 def check_pipeline_status():
     """Monitor pipeline execution status"""
-    cloudwatch = boto3.client('cloudwatch')
-    
     # Check for recent errors
-    end_time = datetime.utcnow()
+    end_time = datetime.now(timezone.utc)
     start_time = end_time - timedelta(hours=1)
     
     logs_client = boto3.client('logs')
     
     try:
-        response = logs_client.filter_log_events(
+        # Page through every match; a single call stops at 1 MB / 10,000
+        # events and silently drops the rest of the window
+        paginator = logs_client.get_paginator('filter_log_events')
+        pages = paginator.paginate(
             logGroupName='/aws/lambda/ecommerce-ml-pipeline',
             startTime=int(start_time.timestamp() * 1000),
             endTime=int(end_time.timestamp() * 1000),
             filterPattern='ERROR'
         )
         
-        if response['events']:
-            print("Recent errors found:")
-            for event in response['events']:
+        found_errors = False
+        for page in pages:
+            for event in page['events']:
+                if not found_errors:
+                    print("Recent errors found:")
+                    found_errors = True
                 print(f"  {event['message']}")
-        else:
+        
+        if not found_errors:
             print("No recent errors found")
             
     except Exception as e:
@@ -15,20 +15,8 @@ def setup_s3_bucket():
         s3_client.create_bucket(Bucket=bucket_name)
         print(f"S3 bucket {bucket_name} created successfully")
         
-        # Create folder structure
-        folders = [
-            'raw-data/customers/',
-            'raw-data/products/',
-            'raw-data/transactions/',
-            'processed-data/',
-            'models/',
-            'feature-store/'
-        ]
-        
-        for folder in folders:
-            s3_client.put_object(Bucket=bucket_name, Key=folder)
-        
-        print("S3 folder structure created")
+        # No folder markers: S3 keys are flat, so raw-data/, processed-data/,
+        # models/ and feature-store/ exist as soon as objects are written
         
     except Exception as e:
         print(f"Error creating S3 bucket: {e}")
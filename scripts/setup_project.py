@@ -3,51 +3,81 @@
 Project Setup Helper
 """
 
+import logging
 import os
 import sys
 import subprocess
 from pathlib import Path
 
-def run_command(command, description):
-    """Run a shell command and handle errors"""
-    print(f"📋 {description}...")
-    try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
-        print(f"✅ {description} completed")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ {description} failed: {e.stderr}")
-        return False
+logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+logger = logging.getLogger(__name__)
+
+STEP_MARKER = "__STEP_OK__"
+
+def run_commands(steps):
+    """Run (command, description) steps in one shell invocation and
+    return the index of the first failed step, or None on success
+    
+    Steps are chained with && and each one echoes a marker when it
+    succeeds, so a single shell start-up covers the whole setup while
+    failures are still attributed to the right step.
+    """
+    for _, description in steps:
+        logger.info(f"📋 {description}...")
+    
+    script = " && ".join(
+        f"{command} && echo {STEP_MARKER} {index}"
+        for index, (command, _) in enumerate(steps)
+    )
+    result = subprocess.run(script, shell=True, capture_output=True, text=True)
+    
+    completed = {
+        int(line.split()[1])
+        for line in result.stdout.splitlines()
+        if line.startswith(STEP_MARKER)
+    }
+    
+    for index, (_, description) in enumerate(steps):
+        if index in completed:
+            logger.info(f"✅ {description} completed")
+        else:
+            logger.error(f"❌ {description} failed: {result.stderr}")
+            return index
+    
+    return None
 
 def main():
-    print("🔧 Setting up AWS ML Project...")
+    logger.info("🔧 Setting up AWS ML Project...")
     
     # Check if we're in a virtual environment
     if not hasattr(sys, 'real_prefix') and not (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix):
-        print("⚠️  Warning: Not in a virtual environment")
+        logger.warning("⚠️  Warning: Not in a virtual environment")
         response = input("Continue anyway? (y/N): ")
         if response.lower() != 'y':
-            print("Setup cancelled")
+            logger.info("Setup cancelled")
             return False
     
-    # Install requirements
-    if not run_command("pip install -r requirements.txt", "Installing Python packages"):
-        return False
-    
-    # Check AWS CLI
-    if not run_command("aws --version", "Checking AWS CLI"):
-        print("Please install AWS CLI: https://docs.aws.amazon.com/cli/latest/userguide/getting-started-install.html")
-        return False
+    # Install requirements, then check the AWS CLI and credentials
+    steps = [
+        ("pip install -r requirements.txt", "Installing Python packages"),
+        ("aws --version", "Checking AWS CLI"),
+        ("aws sts get-caller-identity", "Checking AWS credentials")
+    ]
+    hints = {
+        1: "Please install AWS CLI: https://docs.aws.amazon.com/cli/latest/userguide/getting-started-install.html",
+        2: "Please configure AWS credentials: aws configure"
+    }
     
-    # Check AWS credentials
-    if not run_command("aws sts get-caller-identity", "Checking AWS credentials"):
-        print("Please configure AWS credentials: aws configure")
+    failed_step = run_commands(steps)
+    if failed_step is not None:
+        if failed_step in hints:
+            logger.info(hints[failed_step])
         return False
     
     # Create .env file if it doesn't exist
     env_file = Path('.env')
     if not env_file.exists():
-        print("📄 Creating .env file template...")
+        logger.info("📄 Creating .env file template...")
         with open(env_file, 'w') as f:
             f.write("""# AWS Configuration
 AWS_REGION=us-east-1
@@ -61,11 +91,11 @@ SAGEMAKER_ROLE=arn:aws:iam::YOUR_ACCOUNT_ID:role/SageMakerExecutionRole
 PROJECT_NAME=ecommerce-ml-project
 ENVIRONMENT=development
 """)
-        print("✅ Created .env file template")
-        print("⚠️  Please update .env file with your actual AWS configuration")
+        logger.info("✅ Created .env file template")
+        logger.warning("⚠️  Please update .env file with your actual AWS configuration")
         return False
     
-    print("✅ Project setup completed!")
+    logger.info("✅ Project setup completed!")
     return True
 
 if __name__ == "__main__":
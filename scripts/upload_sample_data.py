@@ -1,17 +1,33 @@
 # scripts/upload_sample_data.py
+import argparse
 import boto3
+from boto3.s3.transfer import TransferConfig
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import logging
 import os
 import pandas as pd
-from dotenv import load_dotenv
+from config.env import get_env
 import sys
 from pathlib import Path
 
-# Load environment variables
-load_dotenv()
+# Files above 8 MB are sent as 16 MB parts, up to 10 in parallel, instead
+# of one single-stream PUT; built once and shared by every upload
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True,
+    io_chunksize=256 * 1024
+)
+
+# Plain-message logging keeps the CLI output unchanged; each record is
+# written under the handler's lock, so parallel uploads don't interleave
+logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+logger = logging.getLogger(__name__)
 
 def check_prerequisites():
     """Check if all prerequisites are met"""
-    print("🔍 Checking prerequisites...")
+    logger.info("🔍 Checking prerequisites...")
     
     # Check if sample data exists
     sample_files = [
@@ -26,20 +42,20 @@ def check_prerequisites():
             missing_files.append(file_path)
     
     if missing_files:
-        print("❌ Missing sample data files:")
+        logger.error("❌ Missing sample data files:")
         for file in missing_files:
-            print(f"   - {file}")
-        print("\n💡 Please run first: python scripts/generate_sample_data.py")
+            logger.error(f"   - {file}")
+        logger.info("\n💡 Please run first: python scripts/generate_sample_data.py")
         return False
     
     # Check environment variables
-    bucket_name = os.getenv('ML_BUCKET')
+    bucket_name = get_env().ml_bucket
     if not bucket_name:
-        print("❌ ML_BUCKET environment variable not set")
-        print("💡 Please run: python scripts/setup_aws_infrastructure.py")
+        logger.error("❌ ML_BUCKET environment variable not set")
+        logger.info("💡 Please run: python scripts/setup_aws_infrastructure.py")
         return False
     
-    print("✅ All prerequisites met")
+    logger.info("✅ All prerequisites met")
     return True
 
 def verify_aws_access():
@@ -48,93 +64,101 @@ def verify_aws_access():
         # Check AWS credentials
         sts_client = boto3.client('sts')
         identity = sts_client.get_caller_identity()
-        print(f"✅ AWS Account verified: {identity['Account']}")
+        logger.info(f"✅ AWS Account verified: {identity['Account']}")
         
         # Check S3 access
-        bucket_name = os.getenv('ML_BUCKET')
+        bucket_name = get_env().ml_bucket
         s3_client = boto3.client('s3')
         s3_client.head_bucket(Bucket=bucket_name)
-        print(f"✅ S3 bucket access verified: {bucket_name}")
+        logger.info(f"✅ S3 bucket access verified: {bucket_name}")
         
         return True
         
     except Exception as e:
-        print(f"❌ AWS access verification failed: {e}")
-        print("💡 Please check your AWS credentials: aws configure")
+        logger.error(f"❌ AWS access verification failed: {e}")
+        logger.info("💡 Please check your AWS credentials: aws configure")
         return False
 
-def upload_file_with_progress(s3_client, local_file, bucket, s3_key):
-    """Upload file with progress indication"""
+def count_csv_records(local_file):
+    """Count data rows by counting newlines in 1 MB binary chunks, without
+    parsing the file (assumes no quoted embedded newlines)"""
+    newlines = 0
+    last_chunk = b''
+    with open(local_file, 'rb') as f:
+        while chunk := f.read(1024 * 1024):
+            newlines += chunk.count(b'\n')
+            last_chunk = chunk
+    
+    if not last_chunk:
+        return 0
+    
+    # A final line without a trailing newline is still a row
+    lines = newlines if last_chunk.endswith(b'\n') else newlines + 1
+    return max(lines - 1, 0)
+
+def upload_file_with_progress(s3_client, local_file, bucket, s3_key, validate=False):
+    """Upload file with progress indication
+    
+    Records are counted from line breaks; validate=True parses the CSV
+    with pandas instead (in chunks, first column only) to catch malformed
+    files before upload.
+    
+    Output is collected and logged as one record at the end, so uploads
+    running on parallel threads do not interleave their lines.
+    """
+    report = []
+    succeeded = False
     try:
         # Get file size for progress
         file_size = os.path.getsize(local_file)
+        if file_size == 0:
+            report.append(f"   ❌ File is empty or invalid CSV: {local_file}")
+            return False
         
-        # Read and validate the CSV file
-        df = pd.read_csv(local_file)
-        record_count = len(df)
-        
-        print(f"📤 Uploading {os.path.basename(local_file)}")
-        print(f"   Records: {record_count:,}")
-        print(f"   Size: {file_size:,} bytes")
-        print(f"   Destination: s3://{bucket}/{s3_key}")
+        if validate:
+            # Full parse, but in bounded memory
+            record_count = sum(
+                len(chunk) for chunk in pd.read_csv(local_file, chunksize=50_000, usecols=[0])
+            )
+        else:
+            record_count = count_csv_records(local_file)
         
-        # Upload the file
-        s3_client.upload_file(local_file, bucket, s3_key)
+        report.append(f"📤 Uploading {os.path.basename(local_file)}")
+        report.append(f"   Records: {record_count:,}")
+        report.append(f"   Size: {file_size:,} bytes")
+        report.append(f"   Destination: s3://{bucket}/{s3_key}")
         
-        # Verify upload
-        response = s3_client.head_object(Bucket=bucket, Key=s3_key)
-        uploaded_size = response['ContentLength']
+        # Upload the file; S3 checks the CRC32 of every part server-side and
+        # upload_file raises on any failure, so no follow-up head_object
+        s3_client.upload_file(
+            local_file, bucket, s3_key,
+            ExtraArgs={'ChecksumAlgorithm': 'CRC32'},
+            Config=TRANSFER_CONFIG
+        )
         
-        if uploaded_size == file_size:
-            print(f"   ✅ Upload successful")
-            return True
-        else:
-            print(f"   ❌ Upload verification failed (size mismatch)")
-            return False
+        report.append(f"   ✅ Upload successful")
+        succeeded = True
+        return True
             
     except pd.errors.EmptyDataError:
-        print(f"   ❌ File is empty or invalid CSV: {local_file}")
+        report.append(f"   ❌ File is empty or invalid CSV: {local_file}")
         return False
     except pd.errors.ParserError as e:
-        print(f"   ❌ CSV parsing error: {e}")
+        report.append(f"   ❌ CSV parsing error: {e}")
         return False
     except Exception as e:
-        print(f"   ❌ Upload failed: {e}")
+        report.append(f"   ❌ Upload failed: {e}")
         return False
+    finally:
+        # Failed uploads keep their ❌ cause visible under WARNING-level handlers
+        log = logger.info if succeeded else logger.error
+        log("\n".join(report))
 
-def create_s3_folder_structure(s3_client, bucket):
-    """Ensure S3 folder structure exists"""
-    print("📁 Creating S3 folder structure...")
-    
-    folders = [
-        'raw-data/',
-        'raw-data/customers/',
-        'raw-data/products/',
-        'raw-data/transactions/',
-        'processed-data/',
-        'models/',
-        'feature-store/',
-        'logs/'
-    ]
-    
-    for folder in folders:
-        try:
-            # Create empty object to represent folder
-            s3_client.put_object(
-                Bucket=bucket,
-                Key=folder,
-                Body=b''
-            )
-        except Exception as e:
-            print(f"   ⚠️  Warning: Could not create folder {folder}: {e}")
-    
-    print("   ✅ Folder structure created")
-
-def upload_sample_data():
+def upload_sample_data(validate=False):
     """Upload generated sample data to S3"""
     
-    print("🚀 Starting sample data upload to S3")
-    print("=" * 50)
+    logger.info("🚀 Starting sample data upload to S3")
+    logger.info("=" * 50)
     
     # Check prerequisites
     if not check_prerequisites():
@@ -144,12 +168,9 @@ def upload_sample_data():
     if not verify_aws_access():
         return False
     
-    bucket_name = os.getenv('ML_BUCKET')
+    bucket_name = get_env().ml_bucket
     s3_client = boto3.client('s3')
     
-    # Create folder structure
-    create_s3_folder_structure(s3_client, bucket_name)
-    
     # Define file mappings
     data_files = {
         'data/sample/customers.csv': 'raw-data/customers/customers.csv',
@@ -157,69 +178,63 @@ def upload_sample_data():
         'data/sample/transactions.csv': 'raw-data/transactions/transactions.csv'
     }
     
-    print(f"\n📦 Uploading {len(data_files)} files to S3...")
-    print("-" * 50)
+    logger.info(f"\n📦 Uploading {len(data_files)} files to S3...")
+    logger.info("-" * 50)
     
     uploaded_files = []
     failed_files = []
     
-    for local_file, s3_key in data_files.items():
-        if os.path.exists(local_file):
-            success = upload_file_with_progress(s3_client, local_file, bucket_name, s3_key)
-            if success:
+    # The files are independent, so upload them concurrently over the
+    # shared (thread-safe) client
+    with ThreadPoolExecutor(max_workers=len(data_files)) as executor:
+        futures = {}
+        for local_file, s3_key in data_files.items():
+            if os.path.exists(local_file):
+                future = executor.submit(
+                    upload_file_with_progress, s3_client, local_file, bucket_name, s3_key,
+                    validate
+                )
+                futures[future] = (local_file, s3_key)
+            else:
+                logger.error(f"❌ File not found: {local_file}")
+                failed_files.append(local_file)
+        
+        for future in as_completed(futures):
+            local_file, s3_key = futures[future]
+            if future.result():
                 uploaded_files.append(s3_key)
             else:
                 failed_files.append(local_file)
-        else:
-            print(f"❌ File not found: {local_file}")
-            failed_files.append(local_file)
     
     # Summary
-    print("\n" + "=" * 50)
-    print("📊 UPLOAD SUMMARY")
-    print("=" * 50)
+    logger.info("\n" + "=" * 50)
+    logger.info("📊 UPLOAD SUMMARY")
+    logger.info("=" * 50)
     
     if uploaded_files:
-        print(f"✅ Successfully uploaded {len(uploaded_files)} files:")
+        logger.info(f"✅ Successfully uploaded {len(uploaded_files)} files:")
         for file_key in uploaded_files:
-            print(f"   📄 s3://{bucket_name}/{file_key}")
+            logger.info(f"   📄 s3://{bucket_name}/{file_key}")
     
     if failed_files:
-        print(f"\n❌ Failed to upload {len(failed_files)} files:")
+        logger.error(f"\n❌ Failed to upload {len(failed_files)} files:")
         for file_path in failed_files:
-            print(f"   📄 {file_path}")
+            logger.error(f"   📄 {file_path}")
     
     # Verify all uploads
     if len(uploaded_files) == len(data_files):
-        print(f"\n🎉 All files uploaded successfully!")
-        print(f"💡 Next step: python main.py")
-        
-        # Optional: Show S3 bucket contents
-        print(f"\n📋 Current S3 bucket structure:")
-        try:
-            response = s3_client.list_objects_v2(
-                Bucket=bucket_name,
-                Prefix='raw-data/',
-                Delimiter='/'
-            )
-            
-            if 'Contents' in response:
-                for obj in response['Contents']:
-                    size_mb = obj['Size'] / (1024 * 1024)
-                    print(f"   📄 {obj['Key']} ({size_mb:.2f} MB)")
-        except Exception as e:
-            print(f"   ⚠️  Could not list bucket contents: {e}")
-        
+        logger.info(f"\n🎉 All files uploaded successfully!")
+        logger.info(f"💡 Next step: python main.py")
         return True
     else:
-        print(f"\n⚠️  Upload incomplete. Please check errors above.")
+        logger.warning(f"\n⚠️  Upload incomplete. Please check errors above.")
         return False
 
 def verify_uploaded_data():
     """Verify that uploaded data is accessible and valid"""
-    print("\n🔍 Verifying uploaded data...")
+    logger.info("\n🔍 Verifying uploaded data...")
     
-    bucket_name = os.getenv('ML_BUCKET')
+    bucket_name = get_env().ml_bucket
     s3_client = boto3.client('s3')
     
     files_to_verify = [
@@ -228,52 +243,71 @@ def verify_uploaded_data():
         'raw-data/transactions/transactions.csv'
     ]
     
+    # One paginated listing returns size and LastModified for every key,
+    # instead of a head_object round trip per file
+    try:
+        paginator = s3_client.get_paginator('list_objects_v2')
+        objects = {
+            obj['Key']: obj
+            for page in paginator.paginate(Bucket=bucket_name, Prefix='raw-data/')
+            for obj in page.get('Contents', [])
+        }
+    except Exception as e:
+        logger.error(f"   ❌ Could not list s3://{bucket_name}/raw-data/: {e}")
+        return False
+    
     verification_results = []
     
     for s3_key in files_to_verify:
-        try:
-            # Get object metadata
-            response = s3_client.head_object(Bucket=bucket_name, Key=s3_key)
-            size = response['ContentLength']
-            last_modified = response['LastModified']
-            
-            print(f"   ✅ {s3_key}")
-            print(f"      Size: {size:,} bytes")
-            print(f"      Modified: {last_modified}")
-            
-            verification_results.append(True)
-            
-        except Exception as e:
-            print(f"   ❌ {s3_key}: {e}")
+        obj = objects.get(s3_key)
+        if obj is None:
+            logger.error(f"   ❌ {s3_key}: not found")
             verification_results.append(False)
+            continue
+        
+        logger.info(f"   ✅ {s3_key}")
+        logger.info(f"      Size: {obj['Size']:,} bytes")
+        logger.info(f"      Modified: {obj['LastModified']}")
+        verification_results.append(True)
+    
+    # Reuse the same listing for the bucket overview
+    logger.info(f"\n📋 Current S3 bucket structure:")
+    for key, obj in objects.items():
+        size_mb = obj['Size'] / (1024 * 1024)
+        logger.info(f"   📄 {key} ({size_mb:.2f} MB)")
     
     all_verified = all(verification_results)
     
     if all_verified:
-        print("\n✅ All uploaded data verified successfully!")
+        logger.info("\n✅ All uploaded data verified successfully!")
     else:
-        print(f"\n❌ Some files failed verification")
+        logger.error(f"\n❌ Some files failed verification")
     
     return all_verified
 
 def show_next_steps():
     """Show next steps after successful upload"""
-    print("\n" + "🎯 NEXT STEPS")
-    print("=" * 50)
-    print("1. Verify data in S3:")
-    print(f"   aws s3 ls s3://{os.getenv('ML_BUCKET')}/raw-data/ --recursive")
-    print("\n2. Run the ML pipeline:")
-    print("   python main.py")
-    print("\n3. Monitor progress:")
-    print("   tail -f ecommerce_ml.log")
-    print("\n4. Check processed data:")
-    print("   ls -la data/processed/")
+    logger.info("\n" + "🎯 NEXT STEPS")
+    logger.info("=" * 50)
+    logger.info("1. Verify data in S3:")
+    logger.info(f"   aws s3 ls s3://{get_env().ml_bucket}/raw-data/ --recursive")
+    logger.info("\n2. Run the ML pipeline:")
+    logger.info("   python main.py")
+    logger.info("\n3. Monitor progress:")
+    logger.info("   tail -f ecommerce_ml.log")
+    logger.info("\n4. Check processed data:")
+    logger.info("   ls -la data/processed/")
 
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description='Upload generated sample data to S3')
+    parser.add_argument('--validate', action='store_true',
+                        help='Parse each CSV with pandas before upload instead of counting lines')
+    args = parser.parse_args()
+    
     try:
         # Upload sample data
-        success = upload_sample_data()
+        success = upload_sample_data(validate=args.validate)
         
         if success:
             # Verify uploaded data
@@ -282,16 +316,16 @@ def main():
             # Show next steps
             show_next_steps()
             
-            print("\n🎉 Sample data upload completed successfully!")
+            logger.info("\n🎉 Sample data upload completed successfully!")
         else:
-            print("\n❌ Sample data upload failed!")
+            logger.error("\n❌ Sample data upload failed!")
             sys.exit(1)
             
     except KeyboardInterrupt:
-        print("\n⏹️  Upload cancelled by user")
+        logger.info("\n⏹️  Upload cancelled by user")
         sys.exit(1)
     except Exception as e:
-        print(f"\n💥 Unexpected error: {e}")
+        logger.exception(f"\n💥 Unexpected error: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -4,7 +4,9 @@ from setuptools import setup, find_packages
 setup(
     name="ecommerce-ml-project",
     version="1.0.0",
-    packages=find_packages(),
+    # Packages live under src/ and are imported as config, data_preparation, ...
+    package_dir={"": "src"},
+    packages=find_packages(where="src"),
     install_requires=[
         "boto3>=1.34.0",
         "pandas>=2.1.4",
@@ -1,32 +1,66 @@
 # src/config/aws_config.py
+import threading
+from functools import cached_property
+
 import boto3
-import os
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from typing import Dict, Any
 
+from config.env import get_env
+
+try:
+    import awscrt  # noqa: F401  (installed with boto3[crt])
+    HAS_CRT = True
+except ImportError:
+    HAS_CRT = False
+
+# Route S3 transfers through the AWS Common Runtime client when it is
+# installed; otherwise let boto3 pick its classic transfer manager
+S3_TRANSFER_CLIENT = 'crt' if HAS_CRT else 'auto'
+
+# botocore defaults to 10 pooled connections, which serializes parallel
+# S3 transfers; size the pool for the pipeline's concurrent uploads
+CLIENT_CONFIG = Config(max_pool_connections=50)
+
 class AWSConfig:
     """AWS Configuration and client management"""
     
     def __init__(self, region_name: str = 'us-east-1'):
         self.region_name = region_name
         self.clients = {}
+        # Session.client() is not thread-safe; serialize first-time creation
+        self._clients_lock = threading.Lock()
+    
+    @cached_property
+    def session(self) -> boto3.Session:
+        """Single boto3 session shared by every client of this config"""
+        return boto3.Session(region_name=self.region_name)
         
     def get_client(self, service_name: str):
         """Get AWS service client with lazy loading"""
         if service_name not in self.clients:
-            self.clients[service_name] = boto3.client(
-                service_name, 
-                region_name=self.region_name
-            )
+            with self._clients_lock:
+                if service_name not in self.clients:
+                    self.clients[service_name] = self.session.client(
+                        service_name,
+                        config=CLIENT_CONFIG
+                    )
         return self.clients[service_name]
     
+    def get_transfer_config(self, **kwargs) -> TransferConfig:
+        """Get S3 transfer config, preferring the CRT client when available"""
+        kwargs.setdefault('preferred_transfer_client', S3_TRANSFER_CLIENT)
+        return TransferConfig(**kwargs)
+    
     def get_session(self):
         """Get boto3 session"""
-        return boto3.Session(region_name=self.region_name)
+        return self.session
 
 # Environment configuration
-AWS_REGION = os.getenv('AWS_REGION', 'us-east-1')
-S3_BUCKET = os.getenv('ML_BUCKET', 'mlops-ecommerce-data-prod-btholath')
-SAGEMAKER_ROLE = os.getenv('SAGEMAKER_ROLE')
+AWS_REGION = get_env().aws_region
+S3_BUCKET = get_env().ml_bucket or 'mlops-ecommerce-data-prod-btholath'
+SAGEMAKER_ROLE = get_env().sagemaker_role
 
 # Data paths
 RAW_DATA_PREFIX = 'raw-data'
@@ -0,0 +1,16 @@
+# src/config/env.py
+import os
+from functools import lru_cache
+from types import SimpleNamespace
+
+from dotenv import load_dotenv
+
+@lru_cache(maxsize=1)
+def get_env() -> SimpleNamespace:
+    """Parse .env once per process and snapshot the project settings"""
+    load_dotenv()
+    return SimpleNamespace(
+        ml_bucket=os.getenv('ML_BUCKET'),
+        aws_region=os.getenv('AWS_REGION', 'us-east-1'),
+        sagemaker_role=os.getenv('SAGEMAKER_ROLE')
+    )
@@ -8,18 +8,54 @@ Reusable authentication / authorization utilities
 
 from __future__ import annotations
 
+import base64
+import calendar
 import datetime as _dt
+import hashlib
+import hmac
+import json
 import os
 import secrets
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from functools import wraps
 from typing import Any, Callable, Iterable, Mapping, MutableMapping
 import bcrypt
 import jwt
-from flask import Request, jsonify
+from flask import Request, Response
+
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+except ImportError:  # fall back to the stdlib encoder
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
 
 from dotenv import load_dotenv
 load_dotenv()               # grabs variables from .env before anything else
+
+# bcrypt cost factor; 12 is bcrypt's default, lower it (e.g. 4) only for
+# tests or bulk user seeding where hashing time dominates
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# decoded-claims cache size for verify_token (one entry per live bearer token)
+VERIFY_CACHE_SIZE = 10_000
+
+# HMAC algorithms generate_token signs itself from a precomputed key state
+_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def json_response(obj: Any, status: int = 200) -> Response:
+    """JSON Response serialized with orjson when available (flask's encoder is stdlib json)."""
+    return Response(_json_dumps(obj), status=status, mimetype="application/json")
+
+
 class AuthError(Exception):
     """Base authentication / authorization error."""
 
@@ -37,29 +73,46 @@ class SecureAuth:
     secret_key: str
     token_expiration_hours: int = 24
     algorithm: str = "HS256"
-    _now: Callable[[], _dt.datetime] = field(default=_dt.datetime.utcnow, repr=False)
+    _now: Callable[[], float] = field(default=time.time, repr=False)
+    _verify_cache: OrderedDict[str, MutableMapping[str, Any]] = field(
+        default_factory=OrderedDict, repr=False, compare=False)
+    _verify_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    _hmac_template: hmac.HMAC | None = field(default=None, init=False, repr=False, compare=False)
+    _jws_header: bytes = field(default=b"", init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Key the HMAC once; each token signs a .copy() of this state instead
+        # of re-hashing the secret, as jwt.encode would on every call
+        digest = _HMAC_DIGESTS.get(self.algorithm)
+        if digest is not None:
+            self._hmac_template = hmac.new(self.secret_key.encode(), digestmod=digest)
+            self._jws_header = _b64url(_json_dumps({"alg": self.algorithm, "typ": "JWT"}))
 
     # ------------------------------------------------------------------ #
     # Password helpers
     # ------------------------------------------------------------------ #
     @staticmethod
-    def hash_password(password: str) -> bytes:
-        """Return a salted bcrypt hash of *password*."""
-        return bcrypt.hashpw(password.encode(), bcrypt.gensalt())
+    def hash_password(password: str, rounds: int | None = None) -> bytes:
+        """Return a salted bcrypt hash of *password* (cost *rounds*, default BCRYPT_ROUNDS)."""
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=rounds or BCRYPT_ROUNDS))
 
     @staticmethod
     def verify_password(password: str, hashed: bytes) -> bool:
-        """True if *password* matches a previously-hashed value."""
+        """True if *password* matches a previously-hashed value.
+
+        The cost is taken from *hashed* itself, so this is the per-login hot
+        path; hash once up front (as web/app.py does for USERS), never per request.
+        """
         return bcrypt.checkpw(password.encode(), hashed)
 
     # ------------------------------------------------------------------ #
     # JWT helpers
     # ------------------------------------------------------------------ #
     def _base_claims(self) -> dict[str, Any]:
-        now = self._now()
+        now = int(self._now())
         return {
             "iat": now,
-            "exp": now + _dt.timedelta(hours=self.token_expiration_hours),
+            "exp": now + self.token_expiration_hours * 3600,
             "jti": secrets.token_hex(16),
         }
 
@@ -73,16 +126,46 @@ class SecureAuth:
         }
         if extra:
             payload.update(extra)
-        return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        if self._hmac_template is None:
+            return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+
+        # same registered-claim handling as jwt.encode: datetimes -> epoch ints
+        for claim in ("exp", "iat", "nbf"):
+            if isinstance(payload.get(claim), _dt.datetime):
+                payload[claim] = calendar.timegm(payload[claim].utctimetuple())
+        signing_input = self._jws_header + b"." + _b64url(_json_dumps(payload))
+        mac = self._hmac_template.copy()
+        mac.update(signing_input)
+        return (signing_input + b"." + _b64url(mac.digest())).decode()
 
     def verify_token(self, token: str) -> MutableMapping[str, Any]:
-        """Decode *token* or raise a specific AuthError."""
-        try:
-            return jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-        except jwt.ExpiredSignatureError as exc:
-            raise TokenExpired("token expired") from exc
-        except jwt.PyJWTError as exc:
-            raise TokenInvalid("token invalid") from exc
+        """Decode *token* or raise a specific AuthError.
+
+        Tokens that already passed signature checks are cached, so repeat
+        requests only re-check ``exp``.
+        """
+        with self._verify_lock:
+            claims = self._verify_cache.get(token)
+            if claims is not None:
+                self._verify_cache.move_to_end(token)
+
+        if claims is None:
+            try:
+                claims = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            except jwt.ExpiredSignatureError as exc:
+                raise TokenExpired("token expired") from exc
+            except jwt.PyJWTError as exc:
+                raise TokenInvalid("token invalid") from exc
+            with self._verify_lock:
+                self._verify_cache[token] = claims
+                if len(self._verify_cache) > VERIFY_CACHE_SIZE:
+                    self._verify_cache.popitem(last=False)
+        elif "exp" in claims and claims["exp"] <= self._now():
+            with self._verify_lock:
+                self._verify_cache.pop(token, None)
+            raise TokenExpired("token expired")
+
+        return dict(claims)  # copy so callers can't mutate the cached claims
 
     # ------------------------------------------------------------------ #
     # Flask decorator
@@ -96,18 +179,23 @@ class SecureAuth:
             def wrapper(*args, **kwargs):                           # type: ignore[override]
                 from flask import request  # local import to keep the core library agnostic
 
-                token = (request.headers.get("Authorization") or "").removeprefix("Bearer ").strip()
-                if not token:
-                    return jsonify(error="missing token"), 401
+                header = request.headers.get("Authorization") or ""
+                if not header.startswith("Bearer "):
+                    return json_response({"error": "missing token"}, 401)
+                token = header[7:].strip()
+                # reject anything that isn't header.payload.signature without
+                # going through jwt.decode and its exception path
+                if token.count(".") != 2:
+                    return json_response({"error": "invalid token"}, 401)
                 try:
                     claims = self.verify_token(token)
                 except TokenExpired:
-                    return jsonify(error="token expired"), 401
+                    return json_response({"error": "token expired"}, 401)
                 except TokenInvalid:
-                    return jsonify(error="invalid token"), 401
+                    return json_response({"error": "invalid token"}, 401)
 
                 if wanted_roles and not wanted_roles.intersection(claims.get("roles", [])):
-                    return jsonify(error="insufficient permissions"), 403
+                    return json_response({"error": "insufficient permissions"}, 403)
 
                 # attach user info to the request context
                 request.claims = claims                                        # type: ignore[attr-defined]
@@ -122,6 +210,11 @@ class SecureAuth:
 # Factory helper – safe default for SECRET_KEY
 # ---------------------------------------------------------------------- #
 def auth_from_env() -> SecureAuth:
+    """Build a SecureAuth from the current SECRET_KEY.
+
+    Not memoized: call it once where the app is built (web/app.py keeps the
+    instance), so a changed secret takes effect on the next app start.
+    """
     secret = os.getenv("SECRET_KEY")
     if not secret:
         raise RuntimeError("SECRET_KEY environment variable is required")
@@ -2,19 +2,14 @@
 Very small Flask app demonstrating SecureAuth usage.
 """
 # ── web/app.py ────────────────────────────────────────────────────────────
-import sys
-from pathlib import Path
-
-# 1.  <web/>               ← this file’s directory
-# 2.  ..                   ← authentication_and_authorization/
-# 3.  append(..) to sys.path so that `import auth.core` works
-sys.path.append(str(Path(__file__).resolve().parent.parent))
+# Run as a module so the package-relative import below resolves:
+#   python -m core_security_components.authentication_and_authorization.web.app
 
 from dotenv import load_dotenv
 load_dotenv()               # grabs variables from .env before anything else
 
-from flask import Flask, jsonify, request
-from auth.core import auth_from_env
+from flask import Flask, Response, request
+from ..auth.core import auth_from_env, json_response
 
 app = Flask(__name__)
 auth = auth_from_env()
@@ -22,33 +17,35 @@ auth = auth_from_env()
 
 # ---------------------------------------------------------------------- #
 # Dummy in-memory user store (replace with real DB/ORM)
+# Hashed once at import; verify_password in /login is the per-request cost
+# (cost factor from BCRYPT_ROUNDS, see auth.core).
 USERS = {"admin": auth.hash_password("secure_password")}
 # ---------------------------------------------------------------------- #
 
 
 @app.route("/login", methods=["POST"])
-def login() -> tuple[dict, int]:
+def login() -> Response:
     username = request.json.get("username")
     password = request.json.get("password")
 
     stored_hash = USERS.get(username)
     if not stored_hash or not auth.verify_password(password, stored_hash):
-        return {"error": "invalid credentials"}, 401
+        return json_response({"error": "invalid credentials"}, 401)
 
     token = auth.generate_token(user_id=username, roles=["admin" if username == "admin" else "user"])
-    return {"access_token": token, "expires_in": auth.token_expiration_hours * 3600}, 200
+    return json_response({"access_token": token, "expires_in": auth.token_expiration_hours * 3600})
 
 
 @app.route("/protected")
 @auth.require_auth()
-def protected() -> dict:
-    return {"message": "success", "claims": request.claims}      # type: ignore[attr-defined]
+def protected() -> Response:
+    return json_response({"message": "success", "claims": request.claims})  # type: ignore[attr-defined]
 
 
 @app.route("/admin")
 @auth.require_auth(roles=["admin"])
-def admin() -> dict:
-    return {"message": "admin endpoint reached"}
+def admin() -> Response:
+    return json_response({"message": "admin endpoint reached"})
 
 @app.route("/", methods=["GET"])
 def index():
@@ -56,10 +53,10 @@ def index():
     Lightweight health check / landing page.
     Returns 200 OK so load balancers and humans both know the service is up.
     """
-    return jsonify(
-        status="ok",
-        message="Secure-Auth API – see /login to get a token."
-    ), 200
+    return json_response({
+        "status": "ok",
+        "message": "Secure-Auth API – see /login to get a token.",
+    })
 
 
 if __name__ == "__main__":
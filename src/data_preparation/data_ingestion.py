@@ -1,15 +1,41 @@
 import boto3
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.json as pajson
+import pyarrow.parquet as pq
 import json
+import hashlib
+import os
+import re
+from pathlib import Path
 from datetime import datetime, timedelta
+from functools import cached_property
 from typing import Dict, List, Optional
 import logging
-from src.config.aws_config import AWSConfig
+from concurrent.futures import ThreadPoolExecutor
+from config.aws_config import AWSConfig
 import io
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # fall back to the stdlib parser
+    _json_loads = json.loads
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bytes per block handed to Arrow's multithreaded CSV reader; used by every
+# CSV read path so they parse (and parallelise) the same way
+CSV_BLOCK_SIZE = 8 << 20
+
+# CSV/JSON objects up to this size are streamed into the Arrow readers;
+# larger ones are fetched as parallel range GETs by the transfer manager
+RANGED_DOWNLOAD_THRESHOLD = 8 * 1024 * 1024
+
 class DataIngestionPipeline:
     """
     Handles data ingestion from multiple sources:
@@ -18,94 +44,308 @@ class DataIngestionPipeline:
     - RDS (transactional data)
     """
     
-    def __init__(self, aws_config: AWSConfig):
+    def __init__(self, aws_config: AWSConfig, cache_dir: Optional[str] = None,
+                 cache_max_entries: int = 32, arrow_dtypes: bool = False):
         self.aws_config = aws_config
         self.s3_client = aws_config.get_client('s3')
-        self.kinesis_client = aws_config.get_client('kinesis')
-        self.glue_client = aws_config.get_client('glue')
+        
+        # Objects above 8 MB are fetched as 16 concurrent 8 MB range GETs
+        # reassembled in place, instead of one single-stream GET
+        self.transfer_config = aws_config.get_transfer_config(
+            multipart_threshold=RANGED_DOWNLOAD_THRESHOLD,
+            multipart_chunksize=8 * 1024 * 1024,
+            max_concurrency=16
+        )
+        
+        # With arrow_dtypes, ingested frames keep Arrow-backed pandas dtypes
+        # (string[pyarrow], int64[pyarrow], ...) so string ops and groupbys
+        # run as Arrow kernels instead of loops over object columns
+        self.types_mapper = pd.ArrowDtype if arrow_dtypes else None
+        
+        # Optional local Parquet cache of parsed S3 objects, keyed by ETag so
+        # an unchanged source object is never downloaded or parsed twice
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.cache_max_entries = cache_max_entries
+        
+    @cached_property
+    def kinesis_client(self):
+        """Kinesis client, only built when streaming ingestion is used"""
+        return self.aws_config.get_client('kinesis')
+    
+    @cached_property
+    def glue_client(self):
+        """Glue client, only built when a crawler is created"""
+        return self.aws_config.get_client('glue')
+    
+    @cached_property
+    def s3_filesystem(self) -> pafs.S3FileSystem:
+        """Arrow's native S3 filesystem; Parquet reads through it stay in
+        C++ instead of calling back into Python (s3fs) for every chunk"""
+        return pafs.S3FileSystem(region=self.aws_config.region_name)
         
     def ingest_from_s3(self, bucket: str, prefix: str, 
-                       file_format: str = 'csv') -> pd.DataFrame:
+                       file_format: str = 'csv',
+                       max_workers: int = 16,
+                       dtype: Optional[Dict[str, str]] = None,
+                       columns: Optional[List[str]] = None,
+                       filters: Optional[ds.Expression] = None) -> pd.DataFrame:
         """
         Ingest batch data from S3
-        Supports multiple file formats as per exam requirements
+        Supports multiple file formats as per exam requirements.
+        Every file under the prefix is read, so sharded layouts such as
+        prefix/part=00/ ... prefix/part=15/ are fetched concurrently.
+        For CSV, dtype maps columns to dtype names (e.g. 'category') that
+        are applied while parsing rather than converted afterwards.
+        With a cache_dir configured, objects whose ETag is unchanged since
+        the last run are loaded from the local Parquet cache instead;
+        without one, Parquet files are read in a single Arrow dataset scan.
+        columns and filters (an Arrow expression such as
+        ds.field('price') > 100) are pushed into that scan, so only the
+        selected column chunks and matching row groups leave S3; for the
+        other paths they are applied once the files are read.
         """
         try:
-            # List objects in S3 prefix
-            response = self.s3_client.list_objects_v2(
-                Bucket=bucket,
-                Prefix=prefix
-            )
-            
-            if 'Contents' not in response:
-                logger.warning(f"No files found in s3://{bucket}/{prefix}")
-                return pd.DataFrame()
+            # List every object under the prefix (one listing covers all shards)
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            pages = paginator.paginate(Bucket=bucket, Prefix=prefix)
             
-            dataframes = []
-            for obj in response['Contents']:
-                key = obj['Key']
-                
-                # Skip directories (keys ending with /)
-                if key.endswith('/'):
-                    continue
+            objects = []
+            for page in pages:
+                for obj in page.get('Contents', []):
+                    key = obj['Key']
                     
-                if not key.endswith(f'.{file_format}'):
-                    continue
-                
-                logger.info(f"Reading file: s3://{bucket}/{key}")
-                
-                # Get object from S3
-                s3_object = self.s3_client.get_object(Bucket=bucket, Key=key)
-                
-                # Read based on format
-                if file_format == 'csv':
-                    # Read CSV directly from S3 object
-                    df = pd.read_csv(io.BytesIO(s3_object['Body'].read()))
-                elif file_format == 'parquet':
-                    # For parquet, we need to use s3fs or download first
-                    df = self._read_parquet_from_s3(bucket, key)
-                elif file_format == 'json':
-                    # Read JSON lines format
-                    content = s3_object['Body'].read().decode('utf-8')
-                    df = pd.read_json(io.StringIO(content), lines=True)
-                else:
-                    raise ValueError(f"Unsupported format: {file_format}")
-                
-                logger.info(f"Read {len(df)} records from {key}")
-                dataframes.append(df)
+                    # Skip directories (keys ending with /)
+                    if key.endswith('/'):
+                        continue
+                    
+                    if not key.endswith(f'.{file_format}'):
+                        continue
+                    
+                    # The listing already carries each ETag and size, so no
+                    # extra head_object call is needed to key the cache or
+                    # pick the download path
+                    objects.append((key, obj.get('ETag', '').strip('"'), obj.get('Size')))
             
-            if not dataframes:
+            if not objects:
                 logger.warning(f"No {file_format} files found in s3://{bucket}/{prefix}")
                 return pd.DataFrame()
             
-            # Combine all dataframes
-            combined_df = pd.concat(dataframes, ignore_index=True)
+            if file_format == 'parquet' and self.cache_dir is None:
+                # One Arrow dataset scan over every listed file: range GETs,
+                # decoding and schema unification all run in parallel in C++
+                dataset = ds.dataset(
+                    [f'{bucket}/{key}' for key, _, _ in objects],
+                    filesystem=self.s3_filesystem,
+                    format='parquet'
+                )
+                combined_df = self._to_pandas(dataset.to_table(
+                    columns=columns, filter=filters, use_threads=True
+                ))
+            elif self.cache_dir is None:
+                # Parse every file straight into Arrow, then concatenate the
+                # tables (no buffer copy) and convert to pandas exactly once,
+                # instead of one conversion per file plus a pd.concat copy
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(objects))) as executor:
+                    tables = list(executor.map(
+                        lambda obj: self._read_table_from_s3(bucket, obj[0], file_format,
+                                                             dtype, size=obj[2]),
+                        objects
+                    ))
+                
+                table = pa.concat_tables(tables, promote_options='default')
+                if filters is not None:
+                    table = table.filter(filters)
+                if columns is not None:
+                    table = table.select(columns)
+                combined_df = self._to_pandas(table)
+            else:
+                # Files (and shards) are independent, so read them in parallel;
+                # map() keeps the original key order for the concat below
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(objects))) as executor:
+                    dataframes = list(executor.map(
+                        lambda obj: self._read_object_cached(bucket, obj[0], obj[1],
+                                                             file_format, dtype,
+                                                             size=obj[2]),
+                        objects
+                    ))
+                
+                # Combine all dataframes; cached and fresh frames of one
+                # dataset share dtypes, so blocks can be reused as-is
+                combined_df = pd.concat(dataframes, ignore_index=True, copy=False)
+                
+                if filters is not None:
+                    combined_df = self._to_pandas(pa.Table.from_pandas(
+                        combined_df, preserve_index=False
+                    ).filter(filters))
+                if columns is not None:
+                    combined_df = combined_df[columns]
             logger.info(f"Ingested {len(combined_df)} total records from S3")
             
+            if self.cache_dir is not None:
+                self._evict_cache()
+            
             return combined_df
             
         except Exception as e:
             logger.error(f"Error ingesting from S3: {str(e)}")
             raise
     
-    def _read_parquet_from_s3(self, bucket: str, key: str) -> pd.DataFrame:
-        """Read parquet file from S3 using boto3"""
+    def _read_object_cached(self, bucket: str, key: str, etag: str, file_format: str,
+                            dtype: Optional[Dict[str, str]] = None,
+                            size: Optional[int] = None) -> pd.DataFrame:
+        """Read a single S3 object, going through the local cache when enabled"""
+        if self.cache_dir is None or not etag:
+            return self._read_object_from_s3(bucket, key, file_format, dtype, size)
+        
+        cache_path = self._cache_path(bucket, key, etag, dtype)
         try:
-            # Download to temporary location and read
-            import tempfile
-            import os
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.parquet') as tmp_file:
-                self.s3_client.download_fileobj(bucket, key, tmp_file)
-                tmp_file.flush()
-                
-                # Read parquet file
-                df = pd.read_parquet(tmp_file.name)
-                
-                # Clean up
-                os.unlink(tmp_file.name)
-                
-                return df
+            table = pq.read_table(cache_path)
+        except FileNotFoundError:
+            # Not cached yet, or evicted by a concurrent ingest: a plain miss
+            table = None
+        if table is not None:
+            logger.info(f"Cache hit for s3://{bucket}/{key} ({etag})")
+            try:
+                # Refresh the mtime so eviction treats the entry as recently used
+                os.utime(cache_path)
+            except FileNotFoundError:
+                pass
+            return self._to_pandas(table)
+        
+        df = self._read_object_from_s3(bucket, key, file_format, dtype, size)
+        
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write under a temporary name and rename, so a concurrent or
+            # interrupted run never sees a half-written cache file
+            tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+            df.to_parquet(tmp_path, engine='pyarrow', index=False)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not cache s3://{bucket}/{key}: {str(e)}")
+        
+        return df
+    
+    def _cache_path(self, bucket: str, key: str, etag: str,
+                    dtype: Optional[Dict[str, str]]) -> Path:
+        """Cache file for an object version; the dtype digest keeps parses
+        with different column types from sharing an entry"""
+        safe_key = re.sub(r'[^A-Za-z0-9._-]+', '_', f"{bucket}/{key}")
+        dtype_digest = hashlib.md5(
+            json.dumps(sorted((dtype or {}).items())).encode('utf-8')
+        ).hexdigest()[:8]
+        return self.cache_dir / f"{safe_key}-{etag}-{dtype_digest}.parquet"
+    
+    def _evict_cache(self):
+        """Drop least recently used cache files beyond cache_max_entries"""
+        try:
+            entries = sorted(
+                self.cache_dir.glob('*.parquet'),
+                key=lambda path: path.stat().st_mtime,
+                reverse=True
+            )
+            for stale in entries[self.cache_max_entries:]:
+                stale.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not evict cache entries: {str(e)}")
+    
+    def _read_object_from_s3(self, bucket: str, key: str, file_format: str,
+                             dtype: Optional[Dict[str, str]] = None,
+                             size: Optional[int] = None) -> pd.DataFrame:
+        """Read a single S3 object into a DataFrame based on its format"""
+        if file_format == 'parquet':
+            logger.info(f"Reading file: s3://{bucket}/{key}")
+            df = self._read_parquet_from_s3(bucket, key)
+            logger.info(f"Read {len(df)} records from {key}")
+            return df
+        
+        return self._to_pandas(self._read_table_from_s3(bucket, key, file_format, dtype, size))
+    
+    def _read_table_from_s3(self, bucket: str, key: str, file_format: str,
+                            dtype: Optional[Dict[str, str]] = None,
+                            size: Optional[int] = None) -> pa.Table:
+        """Parse a single CSV or JSON-lines S3 object into an Arrow table"""
+        logger.info(f"Reading file: s3://{bucket}/{key}")
+        
+        if file_format == 'csv':
+            # Arrow's multithreaded CSV reader parses straight into columnar
+            # buffers; 8 MB blocks let parsing start well before a stream ends
+            with self._open_key(bucket, key, size) as stream:
+                table = pacsv.read_csv(
+                    stream,
+                    read_options=pacsv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE),
+                    convert_options=pacsv.ConvertOptions(
+                        column_types=self._arrow_column_types(dtype or {})
+                    )
+                )
+        elif file_format == 'json':
+            # JSON lines: Arrow's C++ reader parses the raw bytes in parallel
+            # blocks, with no decode to str or per-line Python parsing
+            with self._open_key(bucket, key, size) as stream:
+                table = pajson.read_json(stream)
+        else:
+            raise ValueError(f"Unsupported format: {file_format}")
+        
+        logger.info(f"Read {table.num_rows} records from {key}")
+        return table
+    
+    def _to_pandas(self, table: pa.Table) -> pd.DataFrame:
+        """Convert an Arrow table to pandas; self_destruct frees the Arrow
+        buffers as pandas takes ownership"""
+        return table.to_pandas(
+            split_blocks=True, self_destruct=True, types_mapper=self.types_mapper
+        )
+    
+    def _open_key(self, bucket: str, key: str, size: Optional[int] = None):
+        """Open one object for the CSV/JSON readers
+        
+        Objects above RANGED_DOWNLOAD_THRESHOLD are downloaded through the
+        transfer manager (parallel range GETs, CRT-backed when available).
+        Smaller or unsized ones are streamed: the readers pull them block by
+        block and parse earlier blocks while later ones are still arriving.
+        """
+        if size is not None and size > RANGED_DOWNLOAD_THRESHOLD:
+            return self._download_key(bucket, key)
+        return self.s3_filesystem.open_input_stream(f'{bucket}/{key}')
+    
+    def _download_key(self, bucket: str, key: str) -> io.BytesIO:
+        """Download one object into memory through the transfer manager, so
+        large objects are split into parallel range GETs (CRT-backed when
+        available); ingest_from_s3 runs one of these per worker thread"""
+        buffer = io.BytesIO()
+        self.s3_client.download_fileobj(
+            bucket, key, buffer, Config=self.transfer_config
+        )
+        buffer.seek(0)
+        return buffer
+    
+    @staticmethod
+    def _arrow_column_types(dtype: Dict[str, str]) -> Dict[str, pa.DataType]:
+        """Translate pandas-style dtype names into Arrow CSV column types"""
+        return {
+            column: pa.dictionary(pa.int32(), pa.string()) if name == 'category' else name
+            for column, name in dtype.items()
+        }
+    
+    def _read_parquet_from_s3(self, bucket: str, key: str,
+                              columns: Optional[List[str]] = None,
+                              filters: Optional[ds.Expression] = None) -> pd.DataFrame:
+        """Read parquet file from S3 through Arrow's S3 filesystem
+        
+        Reads go straight into memory (no temp file): the footer is fetched
+        first and pre_buffer coalesces the needed column chunks into
+        concurrent range GETs, so unselected columns and row groups ruled
+        out by filters are never downloaded.
+        """
+        try:
+            table = pq.read_table(
+                f'{bucket}/{key}',
+                filesystem=self.s3_filesystem,
+                columns=columns,
+                filters=filters,
+                pre_buffer=True
+            )
+            return self._to_pandas(table)
                 
         except Exception as e:
             logger.error(f"Error reading parquet from S3: {str(e)}")
@@ -129,25 +369,31 @@ class DataIngestionPipeline:
                 logger.warning(f"No {file_format} files found in s3://{bucket}/{prefix}")
                 return pd.DataFrame()
             
-            dataframes = []
+            # Collect Arrow tables and convert once at the end; files are
+            # expected to share a schema (compatible types are promoted)
+            tables = []
             for file_path in files:
                 logger.info(f"Reading file: s3://{file_path}")
                 
                 if file_format == 'csv':
-                    with fs.open(f's3://{file_path}', 'r') as f:
-                        df = pd.read_csv(f)
+                    # Same multithreaded Arrow parser as ingest_from_s3,
+                    # reading the raw bytes rather than a decoded text stream
+                    with fs.open(f's3://{file_path}', 'rb') as f:
+                        table = pacsv.read_csv(
+                            f, read_options=pacsv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE)
+                        )
                 elif file_format == 'parquet':
-                    df = pd.read_parquet(f's3://{file_path}', filesystem=fs)
+                    table = pq.read_table(file_path, filesystem=self.s3_filesystem)
                 elif file_format == 'json':
-                    with fs.open(f's3://{file_path}', 'r') as f:
-                        df = pd.read_json(f, lines=True)
+                    with fs.open(f's3://{file_path}', 'rb') as f:
+                        table = pajson.read_json(f)
                 else:
                     raise ValueError(f"Unsupported format: {file_format}")
                 
-                dataframes.append(df)
+                tables.append(table)
             
-            # Combine all dataframes
-            combined_df = pd.concat(dataframes, ignore_index=True)
+            # Combine all tables (chunks are linked, not copied)
+            combined_df = self._to_pandas(pa.concat_tables(tables, promote_options='default'))
             logger.info(f"Ingested {len(combined_df)} total records from S3")
             
             return combined_df
@@ -181,38 +427,31 @@ class DataIngestionPipeline:
             raise
     
     def ingest_streaming_data(self, stream_name: str, 
-                             shard_iterator_type: str = 'LATEST') -> List[Dict]:
+                             shard_iterator_type: str = 'LATEST',
+                             max_workers: int = 32) -> List[Dict]:
         """
         Ingest real-time streaming data from Kinesis
+        Shards are independent, so their reads run in parallel
         """
         try:
             # Get shard information
             stream_description = self.kinesis_client.describe_stream(
                 StreamName=stream_name
             )
+            shard_ids = [
+                shard['ShardId']
+                for shard in stream_description['StreamDescription']['Shards']
+            ]
             
             records = []
-            for shard in stream_description['StreamDescription']['Shards']:
-                shard_id = shard['ShardId']
-                
-                # Get shard iterator
-                shard_iterator_response = self.kinesis_client.get_shard_iterator(
-                    StreamName=stream_name,
-                    ShardId=shard_id,
-                    ShardIteratorType=shard_iterator_type
-                )
-                
-                shard_iterator = shard_iterator_response['ShardIterator']
-                
-                # Get records
-                records_response = self.kinesis_client.get_records(
-                    ShardIterator=shard_iterator,
-                    Limit=1000
-                )
-                
-                for record in records_response['Records']:
-                    data = json.loads(record['Data'])
-                    records.append(data)
+            if shard_ids:
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(shard_ids))) as executor:
+                    for shard_records in executor.map(
+                        lambda shard_id: self._read_shard(stream_name, shard_id,
+                                                          shard_iterator_type),
+                        shard_ids
+                    ):
+                        records.extend(shard_records)
             
             logger.info(f"Ingested {len(records)} streaming records")
             return records
@@ -221,6 +460,23 @@ class DataIngestionPipeline:
             logger.error(f"Error ingesting streaming data: {str(e)}")
             raise
     
+    def _read_shard(self, stream_name: str, shard_id: str,
+                    shard_iterator_type: str) -> List[Dict]:
+        """One get_shard_iterator + get_records round trip for a shard"""
+        shard_iterator = self.kinesis_client.get_shard_iterator(
+            StreamName=stream_name,
+            ShardId=shard_id,
+            ShardIteratorType=shard_iterator_type
+        )['ShardIterator']
+        
+        records_response = self.kinesis_client.get_records(
+            ShardIterator=shard_iterator,
+            Limit=1000
+        )
+        
+        # Data is raw bytes, which orjson parses without decoding first
+        return [_json_loads(record['Data']) for record in records_response['Records']]
+    
     def create_glue_crawler(self, crawler_name: str, s3_path: str, 
                            database_name: str) -> Dict:
         """
@@ -3,7 +3,8 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.pipeline import make_pipeline
 import boto3
 import json
 from typing import Dict, List, Tuple, Optional
@@ -20,6 +21,7 @@ class DataTransformer:
         self.scalers = {}
         self.encoders = {}
         self.vectorizers = {}
+        self.feature_matrices = {}
         
     def clean_customer_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -27,9 +29,22 @@ class DataTransformer:
         """
         logger.info("Starting customer data cleaning")
         
-        # Handle missing values
-        df['age'] = df['age'].fillna(df['age'].median())
-        df['income'] = df['income'].fillna(df['income'].median())
+        # Shallow copy: columns are replaced below, never written in place,
+        # so the caller's frame stays untouched without duplicating its data
+        df = df.copy(deep=False)
+        
+        # Handle missing values. Ages are filled on one float array, which
+        # is reused for the outlier quartiles and mask below
+        ages = df['age'].to_numpy(dtype=np.float64, na_value=np.nan)
+        missing_age = np.isnan(ages)
+        if missing_age.any():
+            ages = np.where(missing_age, np.nanmedian(ages), ages)
+            df['age'] = ages
+        
+        incomes = df['income'].to_numpy(dtype=np.float64, na_value=np.nan)
+        missing_income = np.isnan(incomes)
+        if missing_income.any():
+            df['income'] = np.where(missing_income, np.nanmedian(incomes), incomes)
         df['registration_date'] = pd.to_datetime(df['registration_date'])
         
         # Create customer tenure feature
@@ -38,16 +53,18 @@ class DataTransformer:
         ).dt.days
         
         # Clean categorical data
-        df['gender'] = df['gender'].fillna('Unknown')
-        df['location'] = df['location'].fillna('Unknown')
+        for col in ['gender', 'location']:
+            if isinstance(df[col].dtype, pd.CategoricalDtype) and \
+                    'Unknown' not in df[col].cat.categories:
+                df[col] = df[col].cat.add_categories('Unknown')
+            df[col] = df[col].fillna('Unknown')
         
-        # Remove outliers (basic approach)
-        q1_age = df['age'].quantile(0.25)
-        q3_age = df['age'].quantile(0.75)
+        # Remove outliers (basic approach); quartiles include imputed ages
+        q1_age, q3_age = np.quantile(ages, [0.25, 0.75]) if ages.size else (np.nan, np.nan)
         iqr_age = q3_age - q1_age
         df = df[
-            (df['age'] >= q1_age - 1.5 * iqr_age) & 
-            (df['age'] <= q3_age + 1.5 * iqr_age)
+            (ages >= q1_age - 1.5 * iqr_age) & 
+            (ages <= q3_age + 1.5 * iqr_age)
         ]
         
         logger.info(f"Customer data cleaning completed. Shape: {df.shape}")
@@ -59,22 +76,24 @@ class DataTransformer:
         """
         logger.info("Starting transaction data transformation")
         
-        # Convert timestamps
+        df = df.copy(deep=False)
+        
+        # Convert timestamps once; the DatetimeIndex caches its field arrays
         df['transaction_timestamp'] = pd.to_datetime(df['transaction_timestamp'])
-        df['transaction_date'] = df['transaction_timestamp'].dt.date
+        ts = pd.DatetimeIndex(df['transaction_timestamp'])
+        df['transaction_date'] = ts.date
         
-        # Create time-based features
-        print("df['transaction_timestamp'] = ", df['transaction_timestamp'] )
-        df['hour_of_day'] = df['transaction_timestamp'].dt.hour
-        df['day_of_week'] = df['transaction_timestamp'].dt.dayofweek
-        df['month'] = df['transaction_timestamp'].dt.month
-        df['is_weekend'] = df['day_of_week'].isin([5, 6]).astype(int)
+        # Create time-based features (narrow ints: all fit in int8); rows
+        # with a missing timestamp get <NA> via the nullable variants
+        int8, int32 = ('Int8', 'Int32') if ts.hasnans else (np.int8, np.int32)
+        day_of_week = ts.dayofweek
+        df['hour_of_day'] = ts.hour.astype(int8)
+        df['day_of_week'] = day_of_week.astype(int8)
+        df['month'] = ts.month.astype(int8)
+        df['is_weekend'] = (day_of_week >= 5).astype(np.int8)
         
         # Calculate recency features
-        max_date = df['transaction_timestamp'].max()
-        df['days_since_transaction'] = (
-            max_date - df['transaction_timestamp']
-        ).dt.days
+        df['days_since_transaction'] = (ts.max() - ts).days.astype(int32)
         
         # Aggregate customer-level features
         customer_agg = df.groupby('customer_id').agg({
@@ -95,7 +114,6 @@ class DataTransformer:
             'transaction_amount_std'
         ].fillna(0)
         
-        logger.info(f"Transaction transformation completed. Shape: {customer_agg.shape}")
         logger.info(f"Transaction transformation completed. Shape: {customer_agg.shape}")
         return customer_agg, df
 
@@ -106,27 +124,37 @@ class DataTransformer:
         """
         logger.info("Creating product features")
         
+        df = df.copy(deep=False)
+        
         # Text preprocessing for product descriptions
         if 'product_description' in df.columns:
             # Basic text cleaning
             df['product_description'] = df['product_description'].fillna('')
             df['description_length'] = df['product_description'].str.len()
-            df['description_word_count'] = df['product_description'].str.split().str.len()
+            # Count whitespace-separated words without building list columns
+            # (split() yields list<string>[pyarrow] on Arrow-backed frames)
+            df['description_word_count'] = df['product_description'].str.count(r'\S+')
             
-            # TF-IDF vectorization (limited features for demo)
-            tfidf = TfidfVectorizer(
-                max_features=100,
-                stop_words='english',
-                ngram_range=(1, 2)
+            # TF-IDF vectorization (limited features for demo). Hashing the
+            # n-grams into 100 buckets skips the vocabulary build; IDF
+            # weighting is then fitted on the sparse counts
+            tfidf = make_pipeline(
+                HashingVectorizer(
+                    n_features=100,
+                    stop_words='english',
+                    ngram_range=(1, 2),
+                    alternate_sign=False,
+                    norm=None
+                ),
+                TfidfTransformer()
             )
             
-            tfidf_features = tfidf.fit_transform(df['product_description'])
-            tfidf_df = pd.DataFrame(
-                tfidf_features.toarray(),
-                columns=[f'tfidf_{i}' for i in range(100)]
+            # Kept as a CSR matrix (row i <-> i-th row of the returned frame)
+            # rather than densified into mostly-zero columns; sklearn
+            # estimators accept it directly
+            self.feature_matrices['product_tfidf'] = tfidf.fit_transform(
+                df['product_description']
             )
-            
-            df = pd.concat([df.reset_index(drop=True), tfidf_df], axis=1)
             self.vectorizers['product_tfidf'] = tfidf
         
         # Price-based features
@@ -155,38 +183,43 @@ class DataTransformer:
         """
         logger.info("Creating interaction features")
         
-        # Customer-product interaction matrix
-        interaction_features = []
+        # One sort + groupby over all transactions instead of filtering the
+        # transaction frame once per customer
+        tx = transaction_df.sort_values(['customer_id', 'transaction_timestamp'], kind='stable')
+        grouped = tx.groupby('customer_id', sort=False)
         
-        for _, customer in customer_df.iterrows():
-            customer_id = customer['customer_id']
-            customer_transactions = transaction_df[
-                transaction_df['customer_id'] == customer_id
-            ]
-            
-            if len(customer_transactions) == 0:
-                continue
-            
-            # Customer behavior features
-            features = {
-                'customer_id': customer_id,
-                'avg_days_between_purchases': 0,
-                'preferred_category': None,
-                'avg_price_range': customer_transactions['transaction_amount'].mean(),
-                'purchase_frequency': len(customer_transactions),
-                'seasonal_preference': customer_transactions['month'].mode().iloc[0] if len(customer_transactions) > 0 else 1
-            }
-            
-            # Calculate days between purchases
-            if len(customer_transactions) > 1:
-                transaction_dates = sorted(customer_transactions['transaction_timestamp'])
-                date_diffs = [(transaction_dates[i] - transaction_dates[i-1]).days 
-                             for i in range(1, len(transaction_dates))]
-                features['avg_days_between_purchases'] = np.mean(date_diffs)
-            
-            interaction_features.append(features)
+        features = grouped['transaction_amount'].agg(
+            avg_price_range='mean', purchase_frequency='size'
+        )
+        
+        # Days between consecutive purchases; the first row of every
+        # customer has no predecessor, and single purchases average to 0
+        same_customer = tx['customer_id'].eq(tx['customer_id'].shift())
+        day_gaps = tx['transaction_timestamp'].diff().dt.days.where(same_customer)
+        avg_days = day_gaps.groupby(tx['customer_id'], sort=False).mean().fillna(0)
+        
+        # Most frequent purchase month; ties go to the earliest month, as
+        # Series.mode().iloc[0] does
+        month_counts = tx.groupby(['customer_id', 'month']).size().reset_index(name='n')
+        seasonal = (
+            month_counts.sort_values(['customer_id', 'n', 'month'], ascending=[True, False, True])
+            .drop_duplicates('customer_id')
+            .set_index('customer_id')['month']
+        )
         
-        interaction_df = pd.DataFrame(interaction_features)
+        interaction_features = pd.DataFrame({
+            'avg_days_between_purchases': avg_days,
+            'preferred_category': None,
+            'avg_price_range': features['avg_price_range'],
+            'purchase_frequency': features['purchase_frequency'],
+            'seasonal_preference': seasonal
+        })
+        
+        # Keep the customer table's order; customers without transactions
+        # are dropped
+        interaction_df = customer_df[['customer_id']].merge(
+            interaction_features, left_on='customer_id', right_index=True, how='inner'
+        ).reset_index(drop=True)
         logger.info(f"Interaction features created. Shape: {interaction_df.shape}")
         
         return interaction_df
@@ -195,14 +228,34 @@ class DataTransformer:
                           numerical_columns: List[str]) -> pd.DataFrame:
         """
         Normalize numerical features
+        
+        Adds a float32 ``<col>_normalized`` column for every column in
+        *numerical_columns* present in *df*. ``self.scalers[col]`` holds a
+        StandardScaler for each of those columns, fitted on ``df[[col]]``.
         """
         logger.info("Normalizing numerical features")
         
-        for col in numerical_columns:
-            if col in df.columns:
-                scaler = StandardScaler()
-                df[f'{col}_normalized'] = scaler.fit_transform(df[[col]])
-                self.scalers[col] = scaler
+        # Fit one scaler over all columns at once on a float32 (N, C) block
+        cols = [col for col in numerical_columns if col in df.columns]
+        if not cols:
+            return df
+        
+        batch_scaler = StandardScaler(copy=False)
+        normalized = batch_scaler.fit_transform(df[cols].to_numpy(dtype=np.float32))
+        df[[f'{col}_normalized' for col in cols]] = normalized
+        
+        # Split the fitted statistics into per-column scalers, so lookups and
+        # transforms by column name work as with one fit per column
+        seen = np.broadcast_to(batch_scaler.n_samples_seen_, len(cols))
+        for i, col in enumerate(cols):
+            scaler = StandardScaler()
+            scaler.mean_ = batch_scaler.mean_[i:i + 1]
+            scaler.var_ = batch_scaler.var_[i:i + 1]
+            scaler.scale_ = batch_scaler.scale_[i:i + 1]
+            scaler.n_samples_seen_ = int(seen[i])
+            scaler.n_features_in_ = 1
+            scaler.feature_names_in_ = np.array([col], dtype=object)
+            self.scalers[col] = scaler
         
         return df
     
@@ -210,6 +263,11 @@ class DataTransformer:
                             strategy: Dict[str, str] = None) -> pd.DataFrame:
         """
         Comprehensive missing value handling
+        
+        Numeric columns (including nullable integers, whose fill value is
+        rounded) take the median or mean; object and string columns take
+        their mode or an empty string. All-missing columns with no mode are
+        left as they are.
         """
         logger.info("Handling missing values")
         
@@ -220,20 +278,29 @@ class DataTransformer:
                 'text': 'empty_string'
             }
         
-        for column in df.columns:
-            if df[column].isnull().sum() > 0:
-                if df[column].dtype in ['int64', 'float64']:
-                    if strategy['numerical'] == 'median':
-                        df[column].fillna(df[column].median(), inplace=True)
-                    elif strategy['numerical'] == 'mean':
-                        df[column].fillna(df[column].mean(), inplace=True)
-                elif df[column].dtype == 'object':
-                    if strategy['categorical'] == 'mode':
-                        mode_value = df[column].mode()
-                        if len(mode_value) > 0:
-                            df[column].fillna(mode_value.iloc[0], inplace=True)
-                    elif strategy['text'] == 'empty_string':
-                        df[column].fillna('', inplace=True)
+        # One NA scan picks out the dirty columns; each dtype group is then
+        # filled with a single frame-level fillna
+        na_any = df.isna().any()
+        dirty = df[na_any[na_any].index]
+        num_cols = dirty.select_dtypes('number').columns
+        obj_cols = dirty.select_dtypes(['object', 'string']).columns
+        
+        if len(num_cols) > 0 and strategy['numerical'] in ('median', 'mean'):
+            fill_values = df[num_cols].agg(strategy['numerical'])
+            # Nullable integer columns can only take whole numbers
+            int_cols = [col for col in num_cols if pd.api.types.is_integer_dtype(df[col].dtype)]
+            fill_values[int_cols] = fill_values[int_cols].round()
+            df[num_cols] = df[num_cols].fillna(fill_values)
+        
+        if len(obj_cols) > 0:
+            if strategy['categorical'] == 'mode':
+                # Columns with no mode (all missing) are left as they are
+                mode_values = df[obj_cols].mode().head(1).squeeze(axis=0).dropna()
+                if len(mode_values) > 0:
+                    mode_cols = mode_values.index
+                    df[mode_cols] = df[mode_cols].fillna(mode_values)
+            elif strategy['text'] == 'empty_string':
+                df[obj_cols] = df[obj_cols].fillna('')
         
         logger.info("Missing value handling completed")
         return df
\ No newline at end of file
@@ -2,14 +2,41 @@
 # src/data_preparation/data_validation.py
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 from typing import Dict, List, Tuple, Any
 import boto3
 import json
 import logging
 from datetime import datetime, timedelta
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
+# Expected raw-data schemas (read-only, built once at import)
+CUSTOMER_SCHEMA = MappingProxyType({
+    'customer_id': 'string',
+    'age': 'int',
+    'gender': 'string',
+    'income': 'float',
+    'location': 'string',
+    'registration_date': 'datetime'  # parsed from ISO timestamps at ingest
+})
+
+PRODUCT_SCHEMA = MappingProxyType({
+    'product_id': 'string',
+    'category': 'string',
+    'price': 'float',
+    'product_description': 'string'
+})
+
+TRANSACTION_SCHEMA = MappingProxyType({
+    'transaction_id': 'string',
+    'customer_id': 'string',
+    'product_id': 'string',
+    'transaction_amount': 'float',
+    'transaction_timestamp': 'datetime'  # parsed from ISO timestamps at ingest
+})
+
 class DataValidator:
     """
     Comprehensive data validation and quality assessment
@@ -47,32 +74,57 @@ class DataValidator:
         # Check data types
         for col, expected_type in expected_schema.items():
             if col in df.columns:
-                actual_type = str(df[col].dtype)
-                if not self._types_compatible(actual_type, expected_type):
+                actual_dtype = df[col].dtype
+                if not self._types_compatible(actual_dtype, expected_type):
                     validation_result['type_mismatches'][col] = {
                         'expected': expected_type,
-                        'actual': actual_type
+                        'actual': str(actual_dtype)
                     }
                     validation_result['schema_valid'] = False
         
         logger.info(f"Schema validation completed. Valid: {validation_result['schema_valid']}")
         return validation_result
     
-    def _types_compatible(self, actual_type: str, expected_type: str) -> bool:
-        """Check if data types are compatible"""
-        type_mappings = {
-            'int64': ['int', 'integer', 'numeric'],
-            'float64': ['float', 'numeric', 'decimal'],
-            'object': ['string', 'text', 'categorical'],
-            'datetime64[ns]': ['datetime', 'timestamp'],
-            'bool': ['boolean', 'bool']
-        }
+    @staticmethod
+    def _normalize_dtype(dtype):
+        """Map Arrow-backed dtypes (arrow_dtypes ingest) to their pandas kind"""
+        if not isinstance(dtype, pd.ArrowDtype):
+            return dtype
         
-        for actual, compatible_list in type_mappings.items():
-            if actual in actual_type.lower():
-                return expected_type.lower() in compatible_list
+        arrow_type = dtype.pyarrow_dtype
+        if pa.types.is_dictionary(arrow_type):
+            return pd.CategoricalDtype()
+        if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+            return np.dtype(object)
+        if pa.types.is_timestamp(arrow_type):
+            return np.dtype('datetime64[ns]')
+        return dtype
+    
+    def _types_compatible(self, actual_dtype, expected_type: str) -> bool:
+        """Check if data types are compatible"""
+        types = pd.api.types
+        actual_dtype = self._normalize_dtype(actual_dtype)
+        is_categorical = isinstance(actual_dtype, pd.CategoricalDtype)
+        is_bool = types.is_bool_dtype(actual_dtype)
+        is_text = is_categorical or types.is_string_dtype(actual_dtype)
+        # Integers satisfy a float/decimal column; booleans are not numbers here
+        is_number = types.is_numeric_dtype(actual_dtype) and not is_bool
         
-        return False
+        compatible = {
+            'int': types.is_integer_dtype(actual_dtype) and not is_bool,
+            'integer': types.is_integer_dtype(actual_dtype) and not is_bool,
+            'float': is_number,
+            'decimal': is_number,
+            'numeric': is_number,
+            'string': is_text,
+            'text': is_text,
+            'categorical': is_text,
+            'datetime': types.is_datetime64_any_dtype(actual_dtype),
+            'timestamp': types.is_datetime64_any_dtype(actual_dtype),
+            'boolean': is_bool,
+            'bool': is_bool
+        }
+        return compatible.get(expected_type.lower(), False)
     
     def check_data_quality(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
@@ -88,48 +140,54 @@ class DataValidator:
             'quality_score': 0.0
         }
         
+        # Each statistic below is computed in one vectorized pass over the
+        # frame rather than a Python loop of per-column scans
+        
         # Missing value analysis
+        missing_counts = df.isnull().sum()
+        missing_percentages = (missing_counts / len(df)) * 100
         for col in df.columns:
-            missing_count = df[col].isnull().sum()
-            missing_percentage = (missing_count / len(df)) * 100
             quality_report['missing_value_summary'][col] = {
-                'count': int(missing_count),
-                'percentage': round(missing_percentage, 2)
+                'count': int(missing_counts[col]),
+                'percentage': round(missing_percentages[col], 2)
             }
         
         # Duplicate rows
         quality_report['duplicate_rows'] = df.duplicated().sum()
         
         # Outlier detection for numerical columns
-        numerical_cols = df.select_dtypes(include=[np.number]).columns
+        numerical_df = df.select_dtypes(include=[np.number])
+        numerical_cols = numerical_df.columns
+        quartiles = numerical_df.quantile([0.25, 0.75])
+        IQR = quartiles.loc[0.75] - quartiles.loc[0.25]
+        lower_bound = quartiles.loc[0.25] - 1.5 * IQR
+        upper_bound = quartiles.loc[0.75] + 1.5 * IQR
+        outlier_counts = (
+            (numerical_df < lower_bound) | (numerical_df > upper_bound)
+        ).sum()
         for col in numerical_cols:
-            Q1 = df[col].quantile(0.25)
-            Q3 = df[col].quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            
-            outliers = df[(df[col] < lower_bound) | (df[col] > upper_bound)]
             quality_report['outlier_summary'][col] = {
-                'count': len(outliers),
-                'percentage': round((len(outliers) / len(df)) * 100, 2)
+                'count': int(outlier_counts[col]),
+                'percentage': round((outlier_counts[col] / len(df)) * 100, 2)
             }
         
         # Data distribution summary
+        all_null = missing_counts == len(df)
+        stats = numerical_df.loc[:, ~all_null[numerical_cols].to_numpy()].agg(
+            ['mean', 'median', 'std', 'min', 'max']
+        )
+        unique_counts = df.drop(columns=numerical_cols).nunique()
         for col in df.columns:
-            if df[col].dtype in ['int64', 'float64']:
+            if col in numerical_cols:
                 quality_report['data_distribution'][col] = {
-                    'mean': float(df[col].mean()) if not df[col].isnull().all() else None,
-                    'median': float(df[col].median()) if not df[col].isnull().all() else None,
-                    'std': float(df[col].std()) if not df[col].isnull().all() else None,
-                    'min': float(df[col].min()) if not df[col].isnull().all() else None,
-                    'max': float(df[col].max()) if not df[col].isnull().all() else None
+                    stat: None if all_null[col] else float(stats.at[stat, col])
+                    for stat in ['mean', 'median', 'std', 'min', 'max']
                 }
             else:
-                unique_values = df[col].nunique()
+                modes = df[col].mode()
                 quality_report['data_distribution'][col] = {
-                    'unique_values': int(unique_values),
-                    'most_common': df[col].mode().iloc[0] if len(df[col].mode()) > 0 else None
+                    'unique_values': int(unique_counts[col]),
+                    'most_common': modes.iloc[0] if len(modes) > 0 else None
                 }
         
         # Calculate overall quality score
@@ -174,23 +232,26 @@ class DataValidator:
         }
         
         # Rule 1: Transaction amounts should be positive
+        # (violations are counted on the NumPy masks directly rather than
+        # by materializing the offending rows as a filtered DataFrame)
         if 'transaction_amount' in df.columns:
-            negative_amounts = df[df['transaction_amount'] <= 0]
-            if len(negative_amounts) > 0:
+            negative_amounts = np.count_nonzero(df['transaction_amount'].to_numpy() <= 0)
+            if negative_amounts > 0:
                 business_validation['violations'].append({
                     'rule': 'positive_transaction_amounts',
-                    'violation_count': len(negative_amounts),
+                    'violation_count': negative_amounts,
                     'description': 'Transaction amounts must be positive'
                 })
                 business_validation['valid'] = False
         
         # Rule 2: Customer age should be reasonable (18-120)
         if 'age' in df.columns:
-            invalid_ages = df[(df['age'] < 18) | (df['age'] > 120)]
-            if len(invalid_ages) > 0:
+            ages = df['age'].to_numpy()
+            invalid_ages = np.count_nonzero((ages < 18) | (ages > 120))
+            if invalid_ages > 0:
                 business_validation['violations'].append({
                     'rule': 'reasonable_customer_age',
-                    'violation_count': len(invalid_ages),
+                    'violation_count': invalid_ages,
                     'description': 'Customer age should be between 18 and 120'
                 })
                 business_validation['valid'] = False
@@ -201,11 +262,11 @@ class DataValidator:
         
         for col in date_columns:
             if col in df.columns:
-                future_dates = df[pd.to_datetime(df[col]) > current_time]
-                if len(future_dates) > 0:
+                future_dates = int((pd.to_datetime(df[col]) > current_time).sum())
+                if future_dates > 0:
                     business_validation['violations'].append({
                         'rule': f'no_future_dates_{col}',
-                        'violation_count': len(future_dates),
+                        'violation_count': future_dates,
                         'description': f'{col} should not be in the future'
                     })
                     business_validation['valid'] = False
@@ -230,7 +291,7 @@ class DataValidator:
         common_columns = set(reference_df.columns) & set(current_df.columns)
         
         for col in common_columns:
-            if reference_df[col].dtype in ['int64', 'float64']:
+            if reference_df[col].dtype.kind in 'iuf':
                 # Statistical test for numerical columns (simplified KS test)
                 ref_mean = reference_df[col].mean()
                 cur_mean = current_df[col].mean()
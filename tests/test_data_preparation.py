@@ -1,13 +1,38 @@
 # tests/test_data_preparation.py
 import unittest
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from data_preparation.data_validation import DataValidator
+from data_preparation.data_validation import (
+    CUSTOMER_SCHEMA, PRODUCT_SCHEMA, TRANSACTION_SCHEMA, DataValidator
+)
 from data_preparation.data_transformation import DataTransformer
 
+def _interaction_features_reference(customer_df, transaction_df):
+    """Per-customer loop that create_interaction_features used to run"""
+    rows = []
+    for customer_id in customer_df['customer_id']:
+        customer_transactions = transaction_df[transaction_df['customer_id'] == customer_id]
+        if len(customer_transactions) == 0:
+            continue
+        avg_days = 0
+        if len(customer_transactions) > 1:
+            dates = sorted(customer_transactions['transaction_timestamp'])
+            avg_days = np.mean([(dates[i] - dates[i - 1]).days for i in range(1, len(dates))])
+        rows.append({
+            'customer_id': customer_id,
+            'avg_days_between_purchases': avg_days,
+            'preferred_category': None,
+            'avg_price_range': customer_transactions['transaction_amount'].mean(),
+            'purchase_frequency': len(customer_transactions),
+            'seasonal_preference': customer_transactions['month'].mode().iloc[0]
+        })
+    return pd.DataFrame(rows)
+
 class TestDataPreparation(unittest.TestCase):
     
     def setUp(self):
@@ -34,11 +59,309 @@ class TestDataPreparation(unittest.TestCase):
         result = self.validator.validate_data_schema(self.sample_data, schema)
         self.assertTrue(result['schema_valid'])
     
+    def test_data_validation_narrow_dtypes(self):
+        """Test schema validation accepts downcast and categorical columns"""
+        data = pd.DataFrame({
+            'age': pd.Series([25, 35], dtype='int16'),
+            'income': pd.Series([50000.0, 60000.0], dtype='float32'),
+            'gender': pd.Categorical(['Male', 'Female'])
+        })
+        schema = {'age': 'int', 'income': 'float', 'gender': 'string'}
+        
+        result = self.validator.validate_data_schema(data, schema)
+        self.assertTrue(result['schema_valid'])
+    
+    def test_data_validation_dtype_predicates(self):
+        """Test schema types are matched by dtype kind, not by dtype name"""
+        data = pd.DataFrame({
+            'customer_id': pd.Series(['C001', 'C002'], dtype='string'),
+            'age': pd.Series([25, 35], dtype='Int64'),
+            'gender': pd.Categorical(['Male', 'Female']),
+            'registration_date': pd.to_datetime(['2024-01-01', '2024-02-01']),
+            'active': [True, False]
+        })
+        schema = {
+            'customer_id': 'string', 'age': 'int', 'gender': 'int',
+            'registration_date': 'datetime', 'active': 'int'
+        }
+        
+        result = self.validator.validate_data_schema(data, schema)
+        
+        self.assertEqual(set(result['type_mismatches']), {'gender', 'active'})
+    
+    def test_data_validation_arrow_backed_frames(self):
+        """Test frames ingested with arrow_dtypes satisfy the raw-data schemas"""
+        customers = pa.table({
+            'customer_id': ['C001', 'C002'],
+            'age': pa.array([25, 35], pa.int64()),
+            'gender': pa.array(['Male', 'Female']).dictionary_encode(),
+            'income': [50000.0, 60000.0],
+            'location': ['Texas', 'Florida'],
+            'registration_date': pa.array([1, 2], pa.timestamp('ns'))
+        }).to_pandas(types_mapper=pd.ArrowDtype)
+        products = pa.table({
+            'product_id': ['P001', 'P002'],
+            'category': pa.array(['Shoes', 'Shirts']).dictionary_encode(),
+            'price': [10.0, 20.0],
+            'product_description': pa.array(['a', 'b'], pa.large_string())
+        }).to_pandas(types_mapper=pd.ArrowDtype)
+        transactions = pa.table({
+            'transaction_id': ['T1', 'T2'],
+            'customer_id': ['C001', 'C002'],
+            'product_id': ['P001', 'P002'],
+            'transaction_amount': [10.0, 20.0],
+            'transaction_timestamp': pa.array([1, 2], pa.timestamp('us', tz='UTC'))
+        }).to_pandas(types_mapper=pd.ArrowDtype)
+        
+        for data, schema in [(customers, CUSTOMER_SCHEMA), (products, PRODUCT_SCHEMA),
+                             (transactions, TRANSACTION_SCHEMA)]:
+            result = self.validator.validate_data_schema(data, schema)
+            self.assertTrue(result['schema_valid'], result['type_mismatches'])
+        
+        # a dictionary-encoded column is categorical, not an integer
+        result = self.validator.validate_data_schema(customers[['gender']], {'gender': 'int'})
+        self.assertIn('gender', result['type_mismatches'])
+    
     def test_data_quality_check(self):
         """Test data quality assessment"""
         quality_report = self.validator.check_data_quality(self.sample_data)
         self.assertGreater(quality_report['quality_score'], 0)
         self.assertEqual(quality_report['total_rows'], 3)
+    
+    def test_clean_customer_data_leaves_input_untouched(self):
+        """Test customer cleaning does not mutate the caller's frame"""
+        customers = pd.DataFrame({
+            'customer_id': ['C001', 'C002', 'C003'],
+            'age': [25.0, None, 45.0],
+            'income': [50000.0, 60000.0, None],
+            'gender': ['Male', None, 'Male'],
+            'location': ['Texas', 'Florida', None],
+            'registration_date': ['2024-01-01', '2024-02-01', '2024-03-01']
+        })
+        original = customers.copy()
+        
+        cleaned = self.transformer.clean_customer_data(customers)
+        
+        pd.testing.assert_frame_equal(customers, original)
+        self.assertFalse(cleaned['age'].isnull().any())
+        self.assertIn('customer_tenure_days', cleaned.columns)
+    
+    def test_clean_customer_data_categorical_columns(self):
+        """Test missing categories are filled on category-dtype columns"""
+        customers = pd.DataFrame({
+            'customer_id': ['C001', 'C002'],
+            'age': [25, 35],
+            'income': [50000.0, 60000.0],
+            'gender': pd.Categorical(['Male', None]),
+            'location': pd.Categorical([None, 'Texas']),
+            'registration_date': ['2024-01-01', '2024-02-01']
+        })
+        
+        cleaned = self.transformer.clean_customer_data(customers)
+        
+        self.assertEqual(list(cleaned['gender']), ['Male', 'Unknown'])
+        self.assertEqual(list(cleaned['location']), ['Unknown', 'Texas'])
+    
+    def test_clean_customer_data_matches_pandas_path(self):
+        """Test imputation and the IQR filter match the pandas fillna/quantile path"""
+        rng = np.random.default_rng(3)
+        n = 1000
+        customers = pd.DataFrame({
+            'customer_id': [f'C{i:04d}' for i in range(n)],
+            'age': rng.normal(40, 12, n),
+            'income': rng.normal(50000, 15000, n),
+            'gender': rng.choice(['Male', 'Female'], n),
+            'location': rng.choice(['Texas', 'Florida'], n),
+            'registration_date': '2024-01-01'
+        })
+        customers.loc[rng.random(n) < 0.4, 'age'] = np.nan
+        customers.loc[rng.random(n) < 0.1, 'income'] = np.nan
+        customers.loc[:4, 'age'] = [150.0, -20.0, 99.0, 1.0, 120.0]
+        
+        ages = customers['age'].fillna(customers['age'].median())
+        incomes = customers['income'].fillna(customers['income'].median())
+        q1_age, q3_age = ages.quantile(0.25), ages.quantile(0.75)
+        iqr_age = q3_age - q1_age
+        keep = (ages >= q1_age - 1.5 * iqr_age) & (ages <= q3_age + 1.5 * iqr_age)
+        expected = pd.DataFrame({
+            'customer_id': customers['customer_id'], 'age': ages, 'income': incomes
+        })[keep]
+        
+        cleaned = self.transformer.clean_customer_data(customers)
+        
+        pd.testing.assert_frame_equal(cleaned[['customer_id', 'age', 'income']], expected)
+    
+    def test_transform_transaction_data_missing_timestamp(self):
+        """Test a NaT timestamp yields missing date parts instead of failing"""
+        transactions = pd.DataFrame({
+            'customer_id': ['C001', 'C001', 'C002'],
+            'product_id': ['P001', 'P002', 'P001'],
+            'transaction_amount': [10.0, 20.0, 30.0],
+            'transaction_timestamp': ['2024-01-06 10:00', None, '2024-01-08 11:00']
+        })
+        
+        aggregated, enriched = self.transformer.transform_transaction_data(transactions)
+        
+        missing = enriched.iloc[1]
+        for col in ['hour_of_day', 'day_of_week', 'month', 'days_since_transaction']:
+            self.assertTrue(pd.isna(missing[col]))
+        self.assertEqual(missing['is_weekend'], 0)
+        self.assertEqual(list(enriched['days_since_transaction'].iloc[[0, 2]]), [2, 0])
+        self.assertEqual(list(enriched['is_weekend'].iloc[[0, 2]]), [1, 0])
+        self.assertEqual(list(aggregated['transaction_count']), [2, 1])
+    
+    def test_interaction_features_match_reference(self):
+        """Test the grouped interaction features match the per-customer loop"""
+        rng = np.random.default_rng(7)
+        n = 400
+        transactions = pd.DataFrame({
+            'customer_id': rng.choice([f'C{i:03d}' for i in range(60)], n),
+            'transaction_amount': rng.uniform(10, 300, n),
+            'transaction_timestamp': pd.Timestamp('2024-01-01') + pd.to_timedelta(
+                rng.integers(0, 400 * 24, n), unit='h'
+            )
+        })
+        # C900/C901 buy once; C999 never buys
+        transactions = pd.concat([transactions, pd.DataFrame({
+            'customer_id': ['C900', 'C901'],
+            'transaction_amount': [42.0, 7.5],
+            'transaction_timestamp': pd.to_datetime(['2024-03-03', '2024-07-07'])
+        })], ignore_index=True)
+        transactions['month'] = transactions['transaction_timestamp'].dt.month
+        customers = pd.DataFrame({
+            'customer_id': ['C999', 'C901'] + [f'C{i:03d}' for i in rng.permutation(60)] + ['C900']
+        })
+        
+        result = self.transformer.create_interaction_features(customers, None, transactions)
+        expected = _interaction_features_reference(customers, transactions)
+        
+        pd.testing.assert_frame_equal(result, expected)
+        single = result.set_index('customer_id').loc[['C900', 'C901']]
+        self.assertEqual(list(single['avg_days_between_purchases']), [0, 0])
+        self.assertEqual(list(single['purchase_frequency']), [1, 1])
+        self.assertNotIn('C999', set(result['customer_id']))
+    
+    def test_create_product_features_tfidf_matrix(self):
+        """Test product TF-IDF features come back as a sparse side matrix"""
+        products = pd.DataFrame({
+            'product_id': ['P001', 'P002', 'P003'],
+            'category': ['Shoes', 'Shirts', 'Shoes'],
+            'price': [10.0, 50.0, 600.0],
+            'product_description': ['red running shoe', None, 'blue cotton shirt']
+        })
+        
+        features = self.transformer.create_product_features(products)
+        tfidf = self.transformer.feature_matrices['product_tfidf']
+        
+        self.assertEqual(len(features), 3)
+        self.assertFalse(any(col.startswith('tfidf_') for col in features.columns))
+        self.assertEqual(tfidf.format, 'csr')
+        self.assertEqual(tfidf.shape, (3, 100))
+        self.assertEqual(tfidf.dtype, np.float64)
+        np.testing.assert_allclose(
+            np.sqrt(tfidf.multiply(tfidf).sum(axis=1)).A1, [1.0, 0.0, 1.0]
+        )
+        
+        refit = self.transformer.vectorizers['product_tfidf'].transform(['red running shoe'])
+        np.testing.assert_allclose(refit.toarray(), tfidf[0].toarray())
+    
+    def test_handle_missing_values_per_dtype_group(self):
+        """Test numeric, categorical and text columns are filled by their strategy"""
+        def frame():
+            return pd.DataFrame({
+                'age': [20.0, None, 40.0, 90.0],
+                'visits': pd.Series([1, None, 3, 3], dtype='Int64'),
+                'count': [1, 2, 3, 4],
+                'gender': ['Male', None, 'Female', 'Female'],
+                'notes': [None, None, None, None]
+            })
+        
+        filled = self.transformer.handle_missing_values(frame())
+        
+        self.assertEqual(list(filled['age']), [20.0, 40.0, 40.0, 90.0])
+        self.assertEqual(list(filled['visits']), [1, 3, 3, 3])
+        self.assertEqual(list(filled['count']), [1, 2, 3, 4])
+        self.assertEqual(list(filled['gender']), ['Male', 'Female', 'Female', 'Female'])
+        # an all-missing column has no mode and is left alone
+        self.assertTrue(filled['notes'].isna().all())
+        
+        filled = self.transformer.handle_missing_values(frame(), {
+            'numerical': 'mean', 'categorical': 'none', 'text': 'empty_string'
+        })
+        
+        self.assertEqual(list(filled['age']), [20.0, 50.0, 40.0, 90.0])
+        self.assertEqual(list(filled['visits']), [1, 2, 3, 3])
+        self.assertEqual(list(filled['gender']), ['Male', '', 'Female', 'Female'])
+        self.assertEqual(list(filled['notes']), ['', '', '', ''])
+    
+    def test_normalize_features_scalers_by_column(self):
+        """Test normalized columns and per-column scaler lookup"""
+        data = pd.DataFrame({
+            'age': [20.0, 30.0, 40.0, 50.0],
+            'income': [1000, 2000, 4000, 8000],
+            'gender': ['Male', 'Female', 'Male', 'Female']
+        })
+        
+        result = self.transformer.normalize_features(data, ['age', 'income', 'missing'])
+        
+        self.assertEqual(result.shape, (4, 5))
+        self.assertEqual(result['age_normalized'].dtype, np.float32)
+        self.assertEqual(result['income_normalized'].dtype, np.float32)
+        self.assertNotIn('missing_normalized', result.columns)
+        self.assertEqual(set(self.transformer.scalers), {'age', 'income'})
+        for col in ['age', 'income']:
+            scaler = self.transformer.scalers[col]
+            np.testing.assert_allclose(scaler.mean_, [data[col].mean()])
+            np.testing.assert_allclose(
+                scaler.transform(data[[col]]).ravel(), result[f'{col}_normalized'], rtol=1e-6
+            )
+            np.testing.assert_allclose(
+                scaler.inverse_transform(result[[f'{col}_normalized']]).ravel(), data[col],
+                rtol=1e-6
+            )
+    
+    def test_transformer_arrow_backed_frames(self):
+        """Test transformations run on frames ingested with arrow_dtypes"""
+        def to_arrow_dtypes(df):
+            return pa.Table.from_pandas(df).to_pandas(types_mapper=pd.ArrowDtype)
+        
+        customers = to_arrow_dtypes(pd.DataFrame({
+            'customer_id': ['C001', 'C002', 'C003'],
+            'age': [25.0, None, 45.0],
+            'income': [50000.0, 60000.0, None],
+            'gender': ['Male', None, 'Female'],
+            'location': ['Texas', 'Florida', None],
+            'registration_date': pd.to_datetime(['2024-01-01', '2024-02-01', '2024-03-01'])
+        }))
+        products = to_arrow_dtypes(pd.DataFrame({
+            'product_id': ['P001', 'P002', 'P003'],
+            'category': ['Shoes', 'Shirts', 'Shoes'],
+            'price': [10.0, 50.0, 600.0],
+            'product_description': ['red running shoe', None, 'blue  cotton shirt']
+        }))
+        transactions = to_arrow_dtypes(pd.DataFrame({
+            'transaction_id': ['T1', 'T2', 'T3'],
+            'customer_id': ['C001', 'C001', 'C002'],
+            'product_id': ['P001', 'P002', 'P003'],
+            'transaction_amount': [10.0, 20.0, 30.0],
+            'transaction_timestamp': pd.to_datetime([
+                '2024-01-01 10:00', '2024-01-06 12:00', '2024-02-03 09:00'
+            ])
+        }))
+        
+        cleaned = self.transformer.clean_customer_data(customers)
+        aggregated, enriched = self.transformer.transform_transaction_data(transactions)
+        product_features = self.transformer.create_product_features(products)
+        interactions = self.transformer.create_interaction_features(
+            cleaned, product_features, enriched
+        )
+        filled = self.transformer.handle_missing_values(customers.copy())
+        
+        self.assertEqual(len(cleaned), 3)
+        self.assertEqual(list(aggregated['transaction_count']), [2, 1])
+        self.assertEqual(list(product_features['description_word_count']), [3, 0, 3])
+        self.assertEqual(list(interactions['customer_id']), ['C001', 'C002'])
+        self.assertFalse(filled[['age', 'gender']].isna().any().any())
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file